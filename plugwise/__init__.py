@@ -5,36 +5,57 @@ Plugwise backend module for Home Assistant Core.
 
 from __future__ import annotations
 
-from typing import cast
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from functools import partial
+import statistics
+from typing import Any, cast
 
+from plugwise.common import CommandJournal, CommandQueue
 from plugwise.constants import (
+    APPLIANCES,
     DEFAULT_LEGACY_TIMEOUT,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
     DEFAULT_USERNAME,
     DOMAIN_OBJECTS,
+    LOCATIONS,
     LOGGER,
     MODULES,
     NONE,
+    SCENE_CHANGES,
     SMILES,
     STATE_OFF,
     STATE_ON,
     STATUS,
     SYSTEM,
+    ExtractionPlan,
+    GatewayProfile,
+    GatewayTopology,
     GwEntityData,
+    JournalEntry,
+    LatencyStats,
+    PendingWrite,
+    SceneChange,
+    SceneResult,
+    SwitchResult,
     ThermoLoc,
+    UpdateError,
 )
 from plugwise.exceptions import (
     ConnectionFailedError,
     DataMissingError,
     InvalidSetupError,
+    InvalidXMLError,
     PlugwiseError,
+    PlugwiseException,
     ResponseError,
     UnsupportedDeviceError,
 )
 from plugwise.legacy.smile import SmileLegacyAPI
 from plugwise.smile import SmileAPI
 from plugwise.smilecomm import SmileComm
+from plugwise.util import compile_extraction_plan, topology_fingerprint
 
 import aiohttp
 from defusedxml import ElementTree as etree
@@ -52,8 +73,24 @@ class Smile(SmileComm):
         websession: aiohttp.ClientSession,
         port: int = DEFAULT_PORT,
         username: str = DEFAULT_USERNAME,
+        *,
+        coalesce_window: float | None = None,
+        journal_max_age: float | None = None,
+        low_memory: bool = False,
+        optimistic: bool = False,
+        refresh_delay: float | None = None,
     ) -> None:
-        """Set the constructor for this class."""
+        """Set the constructor for this class.
+
+        With a coalesce_window, in seconds, the setpoint-writes per target are coalesced: last-write-wins.
+        With a journal_max_age, in seconds, the set-commands failing on a connection-error are journaled,
+        and replayed by the next update: superseded commands are coalesced, expired commands are dropped.
+        In low-memory mode the XML-documents are released after each update,
+        keeping only the items required by the set-functions.
+        In optimistic mode the set-functions apply the written values to the cached data, pending until the next update.
+        With a refresh_delay, in seconds, the set-functions schedule a refresh of the written entities after the delay.
+        The set-functions skip a write that would not change the cached data, unless called with force=True.
+        """
         self._timeout = DEFAULT_LEGACY_TIMEOUT
         super().__init__(
             host,
@@ -64,12 +101,25 @@ class Smile(SmileComm):
             websession,
         )
 
+        self._command_queue = (
+            None if coalesce_window is None else CommandQueue(coalesce_window)
+        )
         self._cooling_present = False
         self._elga = False
+        self._fingerprint: str = NONE
         self._is_thermostat = False
+        self._journal = (
+            None if journal_max_age is None else CommandJournal(journal_max_age)
+        )
         self._loc_data: dict[str, ThermoLoc] = {}
+        self._low_memory = low_memory
         self._on_off_device = False
         self._opentherm_device = False
+        self._optimistic = optimistic
+        self._plan: ExtractionPlan
+        self._prefetched: dict[str, etree.Element] = {}
+        self._refresh_delay = refresh_delay
+        self._refreshes: set[asyncio.Task[None]] = set()
         self._schedule_old_states: dict[str, dict[str, str]] = {}
         self._smile_api: SmileAPI | SmileLegacyAPI
         self._stretch_v2 = False
@@ -87,6 +137,29 @@ class Smile(SmileComm):
         self.smile.version = Version("0.0.0")
         self.smile.zigbee_mac_address = None
 
+    @property
+    def actuation_latency(self) -> dict[str, LatencyStats]:
+        """Return the actuation-latency distribution per written item, in seconds.
+
+        Measured from the acceptance of a write by the Gateway to the first update or refresh showing the written value.
+        The items are the written platforms, like thermostat and switches, or the entity-items, like active_preset.
+        """
+        stats: dict[str, LatencyStats] = {}
+        for item, latencies in self._smile_api.actuation_latencies.items():
+            p95 = latencies[0]
+            if len(latencies) > 1:
+                p95 = statistics.quantiles(latencies, n=20, method="inclusive")[-1]
+            stats[item] = LatencyStats(
+                gateway_type=self._target_smile,
+                samples=len(latencies),
+                minimum=min(latencies),
+                median=statistics.median(latencies),
+                p95=p95,
+                maximum=max(latencies),
+            )
+
+        return stats
+
     @property
     def cooling_present(self) -> bool:
         """Return the cooling capability."""
@@ -97,6 +170,11 @@ class Smile(SmileComm):
         """Return the gateway-id."""
         return self._smile_api.gateway_id
 
+    @property
+    def entities(self) -> dict[str, GwEntityData]:
+        """Return the entities of the latest update or refresh."""
+        return self._smile_api.gw_entities
+
     @property
     def heater_id(self) -> str:
         """Return the heater-id."""
@@ -107,6 +185,30 @@ class Smile(SmileComm):
         """Return the item-count."""
         return self._smile_api.item_count
 
+    @property
+    def pending_writes(self) -> list[PendingWrite]:
+        """Return the written values applied to the cached data, in optimistic mode.
+
+        The values are pending until confirmed, or replaced, by the next update or refresh.
+        """
+        return self._smile_api.pending_writes
+
+    @property
+    def switch_results(self) -> list[SwitchResult]:
+        """Return the per-member outcome of the latest switching-group write.
+
+        The members are switched concurrently, a failing member does not block the others.
+        """
+        return self._smile_api.switch_results
+
+    @property
+    def update_errors(self) -> list[UpdateError]:
+        """Return the entity-update failures of the latest update.
+
+        The failed entities keep their last-good data, when available.
+        """
+        return self._smile_api.update_errors
+
     @property
     def reboot(self) -> bool:
         """Return the reboot capability.
@@ -115,12 +217,74 @@ class Smile(SmileComm):
         """
         return not self.smile.legacy
 
-    async def connect(self) -> Version:
-        """Connect to the Plugwise Gateway and determine its name, type, version, and other data."""
+    async def connect(self, profile: GatewayProfile | None = None) -> Version:
+        """Connect to the Plugwise Gateway and determine its name, type, version, and other data.
+
+        The gateway-detection is skipped when the provided profile, from export_profile(),
+        still matches the connected Gateway.
+        """
         result = await self._request(DOMAIN_OBJECTS)
+        # Keep the fetched document(s) for the initial full_xml_update()
+        self._prefetched = {DOMAIN_OBJECTS: result}
+        self._fingerprint = topology_fingerprint(result)
+        topology: GatewayTopology | None = None
+        if profile is not None and await self._restore_profile(profile, result):
+            topology = profile["topology"]
+        else:
+            await self._detect_gateway(result)
+
+        self._plan = compile_extraction_plan(self.smile, self._is_thermostat)
+
+        self._smile_api = (
+            SmileAPI(
+                self._cooling_present,
+                self._elga,
+                self._journal,
+                self._loc_data,
+                self._low_memory,
+                self._on_off_device,
+                self._opentherm_device,
+                self._optimistic,
+                self._plan,
+                self._request,
+                self._schedule_old_states,
+                self.smile,
+            )
+            if not self.smile.legacy
+            else SmileLegacyAPI(
+                self._journal,
+                self._loc_data,
+                self._low_memory,
+                self._on_off_device,
+                self._opentherm_device,
+                self._optimistic,
+                self._plan,
+                self._request,
+                self._stretch_v2,
+                self._target_smile,
+                self.smile,
+            )
+        )
+
+        # Update all endpoints on first connect, reusing the documents fetched during detection,
+        # unless the legacy entities are restored from the profile
+        if topology is None or not await self._smile_api.restore_topology(
+            topology, self._prefetched
+        ):
+            await self._smile_api.full_xml_update(self._prefetched)
+        self._prefetched = {}
+
+        return cast(Version, self.smile.version)
+
+    async def _detect_gateway(self, result: etree.Element) -> None:
+        """Helper-function for connect().
+
+        Check the connected Gateway and determine its specifics.
+        """
         # Work-around for Stretch fw 2.7.18
         if not (vendor_names := result.findall("./module/vendor_name")):
             result = await self._request(MODULES)
+            self._prefetched[MODULES] = result
             vendor_names = result.findall("./module/vendor_name")
 
         names: list[str] = []
@@ -151,35 +315,104 @@ class Smile(SmileComm):
         # Determine smile specifics
         await self._smile_detect(result, dsmrmain)
 
-        self._smile_api = (
-            SmileAPI(
-                self._cooling_present,
-                self._elga,
-                self._is_thermostat,
-                self._loc_data,
-                self._on_off_device,
-                self._opentherm_device,
-                self._request,
-                self._schedule_old_states,
-                self.smile,
-            )
-            if not self.smile.legacy
-            else SmileLegacyAPI(
-                self._is_thermostat,
-                self._loc_data,
-                self._on_off_device,
-                self._opentherm_device,
-                self._request,
-                self._stretch_v2,
-                self._target_smile,
-                self.smile,
+    async def _restore_profile(
+        self, profile: GatewayProfile, result: etree.Element
+    ) -> bool:
+        """Helper-function for connect().
+
+        Restore the Gateway specifics from the profile, when the topology and
+        firmware and MAC-address are unchanged.
+        Legacy Gateways are identified by the topology only: it covers the module-ids of the connected hardware,
+        requesting the system or status document for the firmware and MAC-address is skipped.
+        A Stretch without modules in its domain_objects is detected again.
+        """
+        smile = profile["smile"]
+        version = parse(str(smile["version"]))
+        if (
+            profile["fingerprint"] != self._fingerprint
+            or profile["target_smile"] not in SMILES
+            or not self._same_gateway(result, smile, version)
+        ):
+            LOGGER.info("Plugwise gateway profile outdated, detecting the gateway")
+            return False
+
+        self.smile.update(smile)
+        self.smile.version = version
+        self._cooling_present = profile["cooling_present"]
+        self._elga = profile["elga"]
+        self._is_thermostat = profile["is_thermostat"]
+        self._on_off_device = profile["on_off_device"]
+        self._opentherm_device = profile["opentherm_device"]
+        self._stretch_v2 = profile["stretch_v2"]
+        self._target_smile = profile["target_smile"]
+        if not self.smile.legacy:
+            self._timeout = DEFAULT_TIMEOUT
+
+        LOGGER.debug("Plugwise identified as %s, from profile", self._target_smile)
+        return True
+
+    def _same_gateway(
+        self,
+        result: etree.Element,
+        smile: dict[str, bool | str | None],
+        version: Version,
+    ) -> bool:
+        """Helper-function for _restore_profile().
+
+        Check the connected Gateway is of the profiled kind, with the profiled firmware-version and MAC-address.
+        """
+        if (gateway := result.find("./gateway")) is None:
+            # Legacy: identified by the topology when covering the module-ids of the connected hardware
+            return bool(smile["legacy"]) and result.find("./module") is not None
+
+        return (
+            not smile["legacy"]
+            and parse(gateway.find("firmware_version").text) == version
+            and gateway.find("mac_address").text == smile["mac_address"]
+        )
+
+    def export_profile(self) -> GatewayProfile:
+        """Export the Gateway specifics determined in connect().
+
+        Provide the profile to connect() of a later Smile-instance, or when reconnecting,
+        to skip the gateway-detection.
+        """
+        if self._target_smile == NONE:
+            raise PlugwiseError(
+                "Plugwise: not connected, no gateway profile available."
             )
+
+        smile = dict(self.smile)
+        smile["version"] = str(self.smile.version)
+        return GatewayProfile(
+            cooling_present=self._cooling_present,
+            elga=self._elga,
+            fingerprint=self._fingerprint,
+            is_thermostat=self._is_thermostat,
+            on_off_device=self._on_off_device,
+            opentherm_device=self._opentherm_device,
+            smile=smile,
+            stretch_v2=self._stretch_v2,
+            target_smile=self._target_smile,
+            topology=self._smile_api.export_topology(),
         )
 
-        # Update all endpoints on first connect
-        await self._smile_api.full_xml_update()
+    def export_journal(self) -> list[JournalEntry]:
+        """Export the journaled set-commands, not yet replayed.
 
-        return cast(Version, self.smile.version)
+        Provide the entries to restore_journal() of a later Smile-instance, to persist the journal.
+        """
+        if self._journal is None:
+            raise PlugwiseError("Plugwise: no command journal, set a journal_max_age.")
+
+        return self._journal.entries
+
+    def restore_journal(self, entries: list[JournalEntry]) -> None:
+        """Restore the journaled set-commands exported by export_journal(), replayed by the next update."""
+        if self._journal is None:
+            raise PlugwiseError("Plugwise: no command journal, set a journal_max_age.")
+
+        self._journal.restore(entries)
 
     async def _smile_detect(
         self, result: etree.Element, dsmrmain: etree.Element
@@ -311,7 +544,9 @@ class Smile(SmileComm):
             result.find('./appliance[type="thermostat"]') is not None
             or network is not None
         ):
-            system = await self._request(SYSTEM)
+            system = await self._request_with_prefetch(
+                SYSTEM, (LOCATIONS, MODULES, APPLIANCES)
+            )
             self.smile.version = parse(system.find("./gateway/firmware").text)
             return_model = str(system.find("./gateway/product").text)
             self.smile.hostname = system.find("./gateway/hostname").text
@@ -323,7 +558,7 @@ class Smile(SmileComm):
 
         # P1 legacy:
         elif dsmrmain is not None:
-            status = await self._request(STATUS)
+            status = await self._request_with_prefetch(STATUS, (LOCATIONS, MODULES))
             self.smile.version = parse(status.find("./system/version").text)
             return_model = str(status.find("./system/product").text)
             self.smile.hostname = status.find("./network/hostname").text
@@ -339,16 +574,113 @@ class Smile(SmileComm):
         self.smile.legacy = True
         return return_model
 
+    async def _request_with_prefetch(
+        self, endpoint: str, documents: tuple[str, ...]
+    ) -> etree.Element:
+        """Helper-function for _smile_detect_legacy().
+
+        Request the legacy detection endpoint, concurrently prefetch the documents
+        required for the initial full_xml_update() that have not been fetched yet.
+        """
+        prefetch = [item for item in documents if item not in self._prefetched]
+        result, *fetched = await asyncio.gather(
+            self._request(endpoint), *(self._request(item) for item in prefetch)
+        )
+        self._prefetched.update(zip(prefetch, fetched, strict=True))
+        return result
+
     async def async_update(self) -> dict[str, GwEntityData]:
-        """Update the Plughwise Gateway entities and their data and states."""
+        """Update the Plughwise Gateway entities and their data and states.
+
+        The journaled set-commands are replayed first. When the latest request failed on a connection-error,
+        the journal is replayed after the update instead: an offline Gateway is not waited for twice.
+        """
         data: dict[str, GwEntityData] = {}
+        offline = self._request_failed
         try:
+            if not offline:
+                await self._smile_api.replay_journal()
             data = await self._smile_api.async_update()
+            if offline:
+                await self._smile_api.replay_journal()
         except (DataMissingError, KeyError) as err:
             raise PlugwiseError(f"No Plugwise data received: {err}") from err
 
         return data
 
+    async def async_update_entity(self, entity_id: str) -> dict[str, GwEntityData]:
+        """Refresh a single appliance-entity, requesting only its appliance-data.
+
+        Return the entities like async_update(), the other entities keep the data of the latest update.
+        """
+        data: dict[str, GwEntityData] = {}
+        try:
+            data = await self._smile_api.async_update_entity(entity_id)
+        except DataMissingError as err:
+            raise PlugwiseError(f"No Plugwise data received: {err}") from err
+
+        return data
+
+    async def async_update_zone(self, loc_id: str) -> dict[str, GwEntityData]:
+        """Refresh a single zone, requesting only its location-data.
+
+        Return the entities like async_update(), the other entities keep the data of the latest update.
+        """
+        data: dict[str, GwEntityData] = {}
+        try:
+            data = await self._smile_api.async_update_zone(loc_id)
+        except DataMissingError as err:
+            raise PlugwiseError(f"No Plugwise data received: {err}") from err
+
+        return data
+
+    def _refresh_after_write(self) -> None:
+        """Helper-function for the set-functions.
+
+        With a refresh_delay, schedule a refresh of the written entities after the delay, to account for the gateway-processing.
+        The set-function returns without awaiting the refresh.
+        """
+        if self._refresh_delay is None:
+            return
+
+        refresh = asyncio.create_task(self._refresh_written(self._refresh_delay))
+        # Keep a reference, the event-loop only keeps a weak reference to a task
+        self._refreshes.add(refresh)
+        refresh.add_done_callback(self._refreshes.discard)
+
+    async def _refresh_written(self, delay: float) -> None:
+        """Helper-function for _refresh_after_write().
+
+        Refresh the entities written since the latest update or refresh, after the delay.
+        A failed refresh is left to the next update, the set-function has succeeded.
+        """
+        await asyncio.sleep(delay)
+        try:
+            await self._smile_api.async_refresh_written()
+        except (
+            ConnectionFailedError,
+            DataMissingError,
+            InvalidXMLError,
+            ResponseError,
+        ) as err:
+            LOGGER.warning("Plugwise: refresh after write failed: %r", err)
+
+    async def _send_coalesced(
+        self,
+        target: tuple[str, ...],
+        command: Callable[..., Awaitable[None]],
+        *args: Any,
+    ) -> None:
+        """Helper-function for set_temperature(), set_number() and apply_scene().
+
+        Send the command, via the command-queue when a coalesce_window is set.
+        """
+        if self._command_queue is None:
+            await command(*args)
+            return
+
+        await self._command_queue.submit(target, partial(command, *args))
+
     ########################################################################################################
     ###  API Set and HA Service-related Functions                                                        ###
     ########################################################################################################
@@ -359,40 +691,70 @@ class Smile(SmileComm):
         loc_id: str,
         option: str,
         state: str | None = None,
+        *,
+        force: bool = False,
     ) -> None:
         """Set the selected option for the applicable Select."""
         try:
-            await self._smile_api.set_select(key, loc_id, option, state=state)
+            await self._smile_api.set_select(
+                key, loc_id, option, state=state, force=force
+            )
         except ConnectionFailedError as exc:
             raise ConnectionFailedError(
                 f"Failed to set select option '{option}': {str(exc)}"
             ) from exc
 
+        self._refresh_after_write()
+
     async def set_schedule_state(
         self,
         loc_id: str,
         name: str | None = None,
         state: str | None = None,
+        *,
+        force: bool = False,
     ) -> None:
         """Activate/deactivate the Schedule, with the given name, on the relevant Thermostat."""
         try:
-            await self._smile_api.set_schedule_state(loc_id, name=name, state=state)
+            await self._smile_api.set_schedule_state(
+                loc_id, name=name, state=state, force=force
+            )
         except ConnectionFailedError as exc:  # pragma no cover
             raise ConnectionFailedError(
                 f"Failed to set schedule state: {str(exc)}"
             ) from exc  # pragma no cover
 
-    async def set_preset(self, loc_id: str, preset: str) -> None:
+        self._refresh_after_write()
+
+    async def set_preset(
+        self, loc_id: str, preset: str, *, force: bool = False
+    ) -> None:
         """Set the given Preset on the relevant Thermostat."""
         try:
-            await self._smile_api.set_preset(loc_id, preset)
+            await self._smile_api.set_preset(loc_id, preset, force=force)
         except ConnectionFailedError as exc:
             raise ConnectionFailedError(f"Failed to set preset: {str(exc)}") from exc
 
-    async def set_temperature(self, loc_id: str, items: dict[str, float]) -> None:
-        """Set the given Temperature on the relevant Thermostat."""
+        self._refresh_after_write()
+
+    async def set_temperature(
+        self, loc_id: str, items: dict[str, float], *, force: bool = False
+    ) -> None:
+        """Set the given Temperature on the relevant Thermostat.
+
+        With a coalesce_window, the writes for the same location are coalesced.
+        """
+        await self._send_coalesced(
+            ("temperature", loc_id), self._set_temperature, loc_id, items, force
+        )
+        self._refresh_after_write()
+
+    async def _set_temperature(
+        self, loc_id: str, items: dict[str, float], force: bool
+    ) -> None:
+        """Helper-function for set_temperature(), the coalesced command."""
         try:
-            await self._smile_api.set_temperature(loc_id, items)
+            await self._smile_api.set_temperature(loc_id, items, force=force)
         except ConnectionFailedError as exc:
             raise ConnectionFailedError(
                 f"Failed to set temperature: {str(exc)}"
@@ -403,26 +765,52 @@ class Smile(SmileComm):
         dev_id: str,
         key: str,
         temperature: float,
+        *,
+        force: bool = False,
     ) -> None:
-        """Set the maximum boiler- or DHW-setpoint on the Central Heating boiler or the temperature-offset on a Thermostat."""
+        """Set the maximum boiler- or DHW-setpoint on the Central Heating boiler or the temperature-offset on a Thermostat.
+
+        With a coalesce_window, the writes for the same number are coalesced.
+        """
+        await self._send_coalesced(
+            ("number", dev_id, key), self._set_number, dev_id, key, temperature, force
+        )
+        self._refresh_after_write()
+
+    async def _set_number(
+        self, dev_id: str, key: str, temperature: float, force: bool
+    ) -> None:
+        """Helper-function for set_number(), the coalesced command."""
         try:
-            await self._smile_api.set_number(dev_id, key, temperature)
+            await self._smile_api.set_number(dev_id, key, temperature, force=force)
         except ConnectionFailedError as exc:
             raise ConnectionFailedError(
                 f"Failed to set number '{key}': {str(exc)}"
             ) from exc
 
-    async def set_temperature_offset(self, dev_id: str, offset: float) -> None:
+    async def set_temperature_offset(
+        self, dev_id: str, offset: float, *, force: bool = False
+    ) -> None:
         """Set the Temperature offset for thermostats that support this feature."""
         try:  # pragma no cover
-            await self._smile_api.set_offset(dev_id, offset)  # pragma: no cover
+            await self._smile_api.set_offset(
+                dev_id, offset, force=force
+            )  # pragma: no cover
         except ConnectionFailedError as exc:  # pragma no cover
             raise ConnectionFailedError(
                 f"Failed to set temperature offset: {str(exc)}"
             ) from exc  # pragma no cover
 
+        self._refresh_after_write()
+
     async def set_switch_state(
-        self, appl_id: str, members: list[str] | None, model: str, state: str
+        self,
+        appl_id: str,
+        members: list[str] | None,
+        model: str,
+        state: str,
+        *,
+        force: bool = False,
     ) -> bool | None:
         """Set the given State of the relevant Switch.
 
@@ -435,38 +823,51 @@ class Smile(SmileComm):
             raise PlugwiseError("Invalid state supplied to set_switch_state")
 
         try:
-            return await self._smile_api.set_switch_state(
-                appl_id, members, model, state
+            result = await self._smile_api.set_switch_state(
+                appl_id, members, model, state, force=force
             )
         except ConnectionFailedError as exc:
             raise ConnectionFailedError(
                 f"Failed to set switch state: {str(exc)}"
             ) from exc
 
-    async def set_gateway_mode(self, mode: str) -> None:
+        self._refresh_after_write()
+        return result
+
+    async def set_gateway_mode(self, mode: str, *, force: bool = False) -> None:
         """Set the gateway mode."""
         try:  # pragma no cover
-            await self._smile_api.set_gateway_mode(mode)  # pragma: no cover
+            await self._smile_api.set_gateway_mode(
+                mode, force=force
+            )  # pragma: no cover
         except ConnectionFailedError as exc:  # pragma no cover
             raise ConnectionFailedError(
                 f"Failed to set gateway mode: {str(exc)}"
             ) from exc  # pragma no cover
 
-    async def set_regulation_mode(self, mode: str) -> None:
+        self._refresh_after_write()
+
+    async def set_regulation_mode(self, mode: str, *, force: bool = False) -> None:
         """Set the heating regulation mode."""
         try:  # pragma no cover
-            await self._smile_api.set_regulation_mode(mode)  # pragma: no cover
+            await self._smile_api.set_regulation_mode(
+                mode, force=force
+            )  # pragma: no cover
         except ConnectionFailedError as exc:  # pragma no cover
             raise ConnectionFailedError(
                 f"Failed to set regulation mode: {str(exc)}"
             ) from exc  # pragma no cover
 
+        self._refresh_after_write()
+
     async def set_dhw_mode(
         self,
         key: str,
         location: str,
         mode: str,
         length: int,
+        *,
+        force: bool = False,
     ) -> None:
         """Set the domestic hot water heating regulation mode."""
         try:  # pragma no cover
@@ -475,12 +876,204 @@ class Smile(SmileComm):
                 location,
                 mode,
                 length,
+                force=force,
             )  # pragma: no cover
         except ConnectionFailedError as exc:  # pragma no cover
             raise ConnectionFailedError(
                 f"Failed to set dhw mode: {str(exc)}"
             ) from exc  # pragma no cover
 
+        self._refresh_after_write()
+
+    async def apply_scene(
+        self, changes: Sequence[SceneChange], *, force: bool = False
+    ) -> list[SceneResult]:
+        """Apply several changes at once: setpoints, presets, schedule-states, offsets and gateway-modes.
+
+        All changes are validated first, against the cached data: nothing is sent when a change is invalid.
+        The changes for different targets are sent concurrently, within the concurrent-requests limit of the Gateway,
+        the changes for the same target one after another, in the given order.
+        Return the outcome per change, in order: a failed change does not block the others.
+        """
+        invalid: list[str] = []
+        targets: set[tuple[str, str]] = set()
+        for change in changes:
+            if (target := (change.kind, change.target)) in targets:
+                invalid.append(f"{change.kind} of {change.target}: duplicate change")
+            targets.add(target)
+            if (reason := self._validate_change(change)) is not None:
+                invalid.append(f"{change.kind} of {change.target}: {reason}")
+        if invalid:
+            raise PlugwiseError(f"Plugwise: invalid scene, {'; '.join(invalid)}")
+
+        outcomes: list[Exception | None] = [None] * len(changes)
+        per_target: dict[str, list[int]] = {}
+        for index, change in enumerate(changes):
+            per_target.setdefault(change.target, []).append(index)
+        await asyncio.gather(
+            *(
+                self._send_changes(changes, indexes, outcomes, force)
+                for indexes in per_target.values()
+            )
+        )
+        results: list[SceneResult] = []
+        for change, outcome in zip(changes, outcomes, strict=True):
+            if outcome is not None:
+                if not isinstance(outcome, PlugwiseException):
+                    raise outcome
+
+                LOGGER.warning(
+                    "Plugwise: failed to apply %s of %s, error: %s",
+                    change.kind,
+                    change.target,
+                    outcome,
+                )
+            results.append(
+                SceneResult(change, None if outcome is None else str(outcome))
+            )
+
+        self._refresh_after_write()
+        return results
+
+    def _validate_change(self, change: SceneChange) -> str | None:
+        """Helper-function for apply_scene().
+
+        Validate the change against the cached entity-data, return the reason when invalid.
+        """
+        if change.kind not in SCENE_CHANGES:
+            return "unknown change"
+
+        entity = cast(
+            dict[str, Any],
+            self._smile_api.gw_entities.get(change.target, {})
+            if change.kind in ("gateway_mode", "regulation_mode", "temperature_offset")
+            else self._climate_entity(change.target),
+        )
+
+        value = change.value
+        match change.kind:
+            case "gateway_mode" | "regulation_mode":
+                if value not in entity.get(f"{change.kind}s", ()):
+                    return f"invalid mode {value}"
+            case "preset":
+                if value not in entity.get("preset_modes", ()):
+                    return f"invalid preset {value}"
+            case "schedule":
+                if value not in (STATE_OFF, STATE_ON):
+                    return f"invalid schedule state {value}"
+                if "available_schedules" not in entity:
+                    return "no schedules available"
+                if (
+                    change.name is not None
+                    and change.name not in (entity["available_schedules"])
+                ):
+                    return f"invalid schedule {change.name}"
+            case "temperature":
+                if not isinstance(value, dict) or not value:
+                    return "no setpoint provided"
+                return self._validate_setpoints(entity.get("thermostat"), value)
+            case "temperature_offset":
+                if isinstance(value, (dict, str)):
+                    return "no offset provided"
+                return self._validate_setpoints(
+                    entity.get("temperature_offset"), {"setpoint": value}
+                )
+
+        return None
+
+    def _climate_entity(self, loc_id: str) -> GwEntityData:
+        """Helper-function for _validate_change().
+
+        Return the zone, or the first thermostat-entity present in the location.
+        """
+        entities = self._smile_api.gw_entities
+        if "thermostat" in (entity := entities.get(loc_id, {})):
+            return entity
+
+        for entity_id in entities.by_location(loc_id):
+            if "thermostat" in (entity := entities[entity_id]):
+                return entity
+
+        return {}
+
+    @staticmethod
+    def _validate_setpoints(
+        bounds: dict[str, float] | None, items: dict[str, float]
+    ) -> str | None:
+        """Helper-function for _validate_change().
+
+        Validate the setpoint-items against the bounds of the number, return the reason when invalid.
+        """
+        if bounds is None:
+            return "not supported"
+
+        for key, setpoint in items.items():
+            if key not in ("setpoint", "setpoint_high", "setpoint_low") or (
+                key not in bounds
+            ):
+                return f"invalid item {key}"
+            if not bounds["lower_bound"] <= setpoint <= bounds["upper_bound"]:
+                return f"{key} {setpoint} out of bounds"
+
+        return None
+
+    async def _send_changes(
+        self,
+        changes: Sequence[SceneChange],
+        indexes: list[int],
+        outcomes: list[Exception | None],
+        force: bool,
+    ) -> None:
+        """Helper-function for apply_scene().
+
+        Send the changes for one target in order, collect the error per change in outcomes.
+        """
+        for index in indexes:
+            try:
+                await self._send_change(changes[index], force)
+            except Exception as exc:
+                outcomes[index] = exc
+
+    async def _send_change(self, change: SceneChange, force: bool) -> None:
+        """Helper-function for _send_changes().
+
+        The setpoint- and offset-changes are sent like set_temperature() and set_number(),
+        via the command-queue when a coalesce_window is set: a scene does not reorder the queued writes.
+        """
+        api = self._smile_api
+        value = change.value
+        match change.kind:
+            case "gateway_mode":
+                await api.set_gateway_mode(cast(str, value), force=force)
+            case "preset":
+                await api.set_preset(change.target, cast(str, value), force=force)
+            case "regulation_mode":
+                await api.set_regulation_mode(cast(str, value), force=force)
+            case "schedule":
+                await api.set_schedule_state(
+                    change.target,
+                    name=change.name,
+                    state=cast(str, value),
+                    force=force,
+                )
+            case "temperature":
+                await self._send_coalesced(
+                    ("temperature", change.target),
+                    self._set_temperature,
+                    change.target,
+                    cast(dict[str, float], value),
+                    force,
+                )
+            case "temperature_offset":
+                await self._send_coalesced(
+                    ("number", change.target, "temperature_offset"),
+                    self._set_number,
+                    change.target,
+                    "temperature_offset",
+                    cast(float, value),
+                    force,
+                )
+
     async def delete_notification(self) -> None:
         """Delete the active Plugwise Notification."""
         try:
@@ -5,31 +5,64 @@ Plugwise Smile protocol helpers.
 
 from __future__ import annotations
 
-from typing import cast
+import asyncio
+from collections import deque
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Collection,
+    Hashable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+import sys
+import time
+from typing import Any, Final, cast
 
 from plugwise.constants import (
-    ANNA,
+    ACTUATION_TIMEOUT,
     DHW_SETPOINT,
+    GATEWAY_REBOOT,
     GROUP_TYPES,
+    LATENCY_SAMPLES,
+    LOGGER,
     NONE,
     PRIORITY_DEVICE_CLASSES,
+    RULES,
     SPECIAL_PLUG_TYPES,
     SWITCH_GROUP_TYPES,
+    Actuation,
     ActuatorData,
     ApplianceType,
+    ExtractionPlan,
     GwEntityData,
+    JournalEntry,
     ModuleData,
+    PendingWrite,
+    SwitchResult,
+    UpdateError,
+)
+from plugwise.exceptions import (
+    ConnectionFailedError,
+    DataMissingError,
+    PlugwiseException,
 )
 from plugwise.util import (
     check_heater_central,
     check_model,
+    entity_base_data,
     get_vendor_name,
+    replace_element,
     return_valid,
 )
 
 from defusedxml import ElementTree as etree
 from munch import Munch
 
+# The errors caused by missing or malformed data in a single entity
+ENTITY_ERRORS: Final = (AttributeError, KeyError, TypeError, ValueError)
+
 
 def get_zigbee_data(
     module: etree.Element, module_data: ModuleData, legacy: bool
@@ -48,30 +81,648 @@ def get_zigbee_data(
         module_data["reachable"] = zb_node.find("reachable").text == "true"
 
 
+class EntityRegistry(dict[str, GwEntityData]):
+    """The gw_entities dict, with secondary indexes.
+
+    The first gateway and heater_central entities are kept in front, in PRIORITY_DEVICE_CLASSES order.
+    The entity-ids are indexed by dev_class, by location and by zigbee_mac_address: all mutators
+    go through __setitem__() and __delitem__(), keeping the indexes current.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        super().__init__()
+        self._by_class: dict[str, list[str]] = {}
+        self._by_location: dict[str, list[str]] = {}
+        self._by_zigbee_mac: dict[str, str] = {}
+
+    def __setitem__(self, entity_id: str, entity: GwEntityData) -> None:
+        """Add or replace an entity, update the indexes and the priority-order."""
+        if entity_id in self:
+            self._unindex(entity_id)
+
+        super().__setitem__(entity_id, entity)
+        dev_class = entity["dev_class"]
+        self._by_class.setdefault(dev_class, []).append(entity_id)
+        if (location := entity.get("location")) is not None:
+            self._by_location.setdefault(location, []).append(entity_id)
+        if (zigbee_mac := entity.get("zigbee_mac_address")) is not None:
+            self._by_zigbee_mac[zigbee_mac] = entity_id
+
+        if (
+            dev_class in PRIORITY_DEVICE_CLASSES
+            and self._by_class[dev_class][0] == entity_id
+        ):
+            self._prioritize()
+
+    def __delitem__(self, entity_id: str) -> None:
+        """Remove an entity and its index-entries."""
+        self._unindex(entity_id)
+        super().__delitem__(entity_id)
+
+    def __ior__(self, other: Any) -> EntityRegistry:  # type: ignore[misc,override]
+        """Add or replace the entities of other."""
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Remove all entities and index-entries."""
+        super().clear()
+        self._by_class.clear()
+        self._by_location.clear()
+        self._by_zigbee_mac.clear()
+
+    def pop(self, entity_id: str, *default: Any) -> Any:
+        """Remove an entity and its index-entries, return the entity or the default."""
+        if entity_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(entity_id)
+
+        entity = self[entity_id]
+        del self[entity_id]
+        return entity
+
+    def popitem(self) -> tuple[str, GwEntityData]:
+        """Remove the last-inserted entity and its index-entries, return the entity-id and entity."""
+        if not self:
+            raise KeyError("popitem(): entity registry is empty")
+
+        entity_id = next(reversed(self))
+        return entity_id, self.pop(entity_id)
+
+    def setdefault(self, entity_id: str, default: GwEntityData) -> GwEntityData:
+        """Add the default entity when not present, return the entity."""
+        if entity_id not in self:
+            self[entity_id] = default
+
+        return self[entity_id]
+
+    def update(self, other: Any = (), /, **kwargs: GwEntityData) -> None:
+        """Add or replace the entities of other and kwargs."""
+        for entity_id, entity in dict(other, **kwargs).items():
+            self[entity_id] = entity
+
+    def by_class(self, dev_class: str) -> list[str]:
+        """Return the entity-ids of the given dev_class, in insert-order."""
+        return self._by_class.get(dev_class, [])
+
+    def by_location(self, location: str) -> list[str]:
+        """Return the entity-ids present in the given location, in insert-order."""
+        return self._by_location.get(location, [])
+
+    def by_zigbee_mac(self, zigbee_mac: str) -> str | None:
+        """Return the entity-id with the given zigbee_mac_address."""
+        return self._by_zigbee_mac.get(zigbee_mac)
+
+    def rename(self, entity_id: str, new_id: str) -> None:
+        """Move an entity to a new entity-id."""
+        entity = self[entity_id]
+        del self[entity_id]
+        self[new_id] = entity
+
+    def _prioritize(self) -> None:
+        """Place the gateway and optional heater_central entities as 1st and 2nd."""
+        front = [
+            entity_ids[0]
+            for dev_class in PRIORITY_DEVICE_CLASSES
+            if (entity_ids := self._by_class.get(dev_class))
+        ]
+        entities = dict(self)
+        # Reorder only, the indexes are unchanged
+        super().clear()
+        for entity_id in front:
+            super().__setitem__(entity_id, entities.pop(entity_id))
+        for entity_id, entity in entities.items():
+            super().__setitem__(entity_id, entity)
+
+    def _unindex(self, entity_id: str) -> None:
+        """Remove the index-entries of an entity."""
+        entity = self[entity_id]
+        self._by_class[entity["dev_class"]].remove(entity_id)
+        if (location := entity.get("location")) is not None:
+            self._by_location[location].remove(entity_id)
+        if (zigbee_mac := entity.get("zigbee_mac_address")) is not None:
+            self._by_zigbee_mac.pop(zigbee_mac, None)
+
+
+class CommandQueue:
+    """Coalescing queue for the set-commands of a gateway.
+
+    A command waits for the window, a later command for the same target replaces it: last-write-wins.
+    The commands are sent one at a time, in the order of submission of their targets, by a task of the queue:
+    a cancelled caller does not cancel the command awaited by the other callers.
+    All callers of a coalesced command await its completion, and receive its result or error.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Init."""
+        self._pending: dict[
+            Hashable, tuple[Callable[[], Awaitable[Any]], asyncio.Future[Any]]
+        ] = {}
+        self._send_lock = asyncio.Lock()
+        self._senders: set[asyncio.Task[None]] = set()
+        self._window = window
+
+    async def submit(
+        self, target: Hashable, command: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Submit the command for the target, return the result of the command sent for the target."""
+        if (pending := self._pending.get(target)) is not None:
+            self._pending[target] = (command, pending[1])
+            return await asyncio.shield(pending[1])
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[target] = (command, future)
+        sender = asyncio.create_task(self._send(target, future))
+        # Keep a reference, the event-loop only keeps a weak reference to a task
+        self._senders.add(sender)
+        sender.add_done_callback(self._senders.discard)
+        return await asyncio.shield(future)
+
+    async def _send(self, target: Hashable, future: asyncio.Future[Any]) -> None:
+        """Helper-function for submit().
+
+        Send the latest command for the target after the window, set its outcome on the future.
+        """
+        try:
+            await asyncio.sleep(self._window)
+            async with self._send_lock:
+                command, _ = self._pending.pop(target)
+                try:
+                    future.set_result(await command())
+                except Exception as exc:
+                    future.set_exception(exc)
+        finally:
+            if not future.done():
+                self._pending.pop(target, None)
+                future.cancel()
+
+
+class CommandJournal:
+    """Journal of the set-commands not sent due to a connection-failure of a gateway.
+
+    A later put-command for the same uri supersedes the journaled one: last-write-wins,
+    also when the later command is sent successfully.
+    Each command expires after max_age, an expired command is dropped instead of replayed.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        """Init."""
+        self._entries: list[JournalEntry] = []
+        self._max_age = max_age
+
+    @property
+    def entries(self) -> list[JournalEntry]:
+        """Return the journaled commands, in order."""
+        return list(self._entries)
+
+    def add(
+        self, uri: str, method: str, data: str | None, writes: list[PendingWrite]
+    ) -> None:
+        """Journal the command and the items it writes."""
+        self.restore(
+            [
+                JournalEntry(
+                    data=data,
+                    expires=time.time() + self._max_age,
+                    method=method,
+                    uri=uri,
+                    writes=writes,
+                )
+            ]
+        )
+
+    def discard(self, uri: str) -> None:
+        """Drop the journaled put-command for the uri, superseded by a successful write."""
+        self._entries = [
+            item
+            for item in self._entries
+            if (item["method"], item["uri"]) != ("put", uri)
+        ]
+
+    def restore(self, entries: Iterable[JournalEntry]) -> None:
+        """Journal the commands, for instance from a persisted journal."""
+        for entry in entries:
+            if entry["method"] == "put":
+                self.discard(entry["uri"])
+            self._entries.append(entry)
+
+    async def replay(self, send: Callable[[JournalEntry], Awaitable[None]]) -> int:
+        """Send the journaled commands in order, drop the expired commands.
+
+        Stop at a connection-failure, keeping the remaining commands. Return the number of commands sent.
+        """
+        sent = 0
+        while self._entries:
+            entry = self._entries[0]
+            if entry["expires"] >= time.time():
+                try:
+                    await send(entry)
+                    sent += 1
+                except ConnectionFailedError:
+                    return sent
+                except PlugwiseException as exc:
+                    LOGGER.warning(
+                        "Plugwise: journaled %s %s failed, error: %r",
+                        entry["method"],
+                        entry["uri"],
+                        exc,
+                    )
+            else:
+                LOGGER.warning(
+                    "Plugwise: journaled %s %s expired",
+                    entry["method"],
+                    entry["uri"],
+                )
+            # A command superseding the entry may have been journaled meanwhile
+            if entry in self._entries:
+                self._entries.remove(entry)
+
+        return sent
+
+
 class SmileCommon:
     """The SmileCommon class."""
 
     def __init__(self) -> None:
         """Init."""
+        self._actuations: list[Actuation] = []
         self._cooling_present: bool
         self._count: int
         self._domain_objects: etree.Element
         self._heater_id: str = NONE
+        self._latencies: dict[str, deque[float]] = {}
+        self._journal: CommandJournal | None
         self._on_off_device: bool
-        self.gw_entities: dict[str, GwEntityData] = {}
+        self._optimistic: bool
+        self._pending_writes: list[PendingWrite] = []
+        self._plan: ExtractionPlan
+        self._previous_entities: Mapping[str, GwEntityData] = {}
+        self._request: Callable[..., Awaitable[Any]]
+        self._switch_results: list[SwitchResult] = []
+        self._update_errors: list[UpdateError] = []
+        self._written: set[str] = set()
+        self._written_rules: set[str] = set()
+        self.gw_entities = EntityRegistry()
         self.smile: Munch
 
+    @property
+    def actuation_latencies(self) -> dict[str, list[float]]:
+        """Return the latest actuation-latencies per written item, in seconds."""
+        return {item: list(latencies) for item, latencies in self._latencies.items()}
+
     @property
     def heater_id(self) -> str:
         """Return the heater-id."""
         return self._heater_id
 
-    def check_name(self, name: str) -> bool:
-        """Helper-function checking the smile-name.
+    @property
+    def pending_writes(self) -> list[PendingWrite]:
+        """Return the written values applied to the cached entity-data, not yet confirmed by an update."""
+        return self._pending_writes
+
+    @property
+    def switch_results(self) -> list[SwitchResult]:
+        """Return the per-member outcome of the latest switching-group write."""
+        return self._switch_results
+
+    @property
+    def update_errors(self) -> list[UpdateError]:
+        """Return the entity-update failures of the latest update."""
+        return self._update_errors
+
+    def _written_items(
+        self,
+        entity_ids: Iterable[str],
+        platform: str | None,
+        items: Mapping[str, bool | float | str],
+    ) -> list[PendingWrite]:
+        """Helper-function for the set-functions.
+
+        Return the items written by a set-command, only the items already present in the entity-data.
+        """
+        writes: list[PendingWrite] = []
+        for entity_id in entity_ids:
+            if (entity := self.gw_entities.get(entity_id)) is None:
+                continue
+
+            target = cast(
+                dict[str, Any], entity if platform is None else entity.get(platform, {})
+            )
+            writes.extend(
+                PendingWrite(entity_id, platform, key, value)
+                for key, value in items.items()
+                if key in target
+            )
+
+        return writes
+
+    def _apply_written(self, writes: Iterable[PendingWrite]) -> None:
+        """Helper-function for call_request() and the set-functions.
+
+        Track the actuation of the written items, accepted by the gateway just before.
+        An item already holding the written value, e.g. by a forced write, has no actuation to track.
+        In optimistic mode, apply the written items to the cached entity-data, pending until confirmed by an update.
+        """
+        accepted = time.monotonic()
+        for write in writes:
+            # A later write supersedes the tracked write of the same item
+            self._actuations = [
+                actuation
+                for actuation in self._actuations
+                if actuation.write[:3] != write[:3]
+            ]
+            if self._written_value(write) != write.value:
+                self._actuations.append(Actuation(write, accepted))
+            if not self._optimistic:
+                continue
+
+            entity = cast(dict[str, Any], self.gw_entities.get(write.entity_id, {}))
+            target = entity if write.platform is None else entity.get(write.platform)
+            if target is not None and write.key in target:
+                target[write.key] = write.value
+                self._pending_writes.append(write)
+
+    def _apply_written_xml(
+        self, document: etree.Element, locator: str, text: str
+    ) -> None:
+        """Helper-function for the set-functions.
+
+        In optimistic mode, apply the written value to the cached XML-document.
+        """
+        if self._optimistic and (item := document.find(locator)) is not None:
+            item.text = text
+
+    def _confirm_pending_writes(
+        self, entity_ids: Collection[str] | None = None
+    ) -> None:
+        """Helper-function for async_update() and the entity-refreshes.
+
+        Drop the pending writes of the updated entities, all when None, log the writes not confirmed by the update.
+        Record the actuation-latency of the tracked writes shown by the update.
+        """
+        pending: list[PendingWrite] = []
+        for write in self._pending_writes:
+            if entity_ids is not None and write.entity_id not in entity_ids:
+                pending.append(write)
+                continue
+
+            if self._written_value(write) != write.value:
+                LOGGER.debug(
+                    "Plugwise: %s of entity %s not confirmed by the update",
+                    write.key,
+                    write.entity_id,
+                )
+
+        self._pending_writes = pending
+
+        now = time.monotonic()
+        actuations: list[Actuation] = []
+        for actuation in self._actuations:
+            write = actuation.write
+            if (
+                entity_ids is None or write.entity_id in entity_ids
+            ) and self._written_value(write) == write.value:
+                self._latencies.setdefault(
+                    write.platform or write.key, deque(maxlen=LATENCY_SAMPLES)
+                ).append(now - actuation.accepted)
+            elif now - actuation.accepted < ACTUATION_TIMEOUT:
+                actuations.append(actuation)
+
+        self._actuations = actuations
+
+    def _written_value(self, write: PendingWrite) -> Any:
+        """Helper-function for _apply_written() and _confirm_pending_writes().
+
+        Return the value of the written item in the entity-data.
+        """
+        entity = cast(dict[str, Any], self.gw_entities.get(write.entity_id, {}))
+        target = entity if write.platform is None else entity.get(write.platform, {})
+        return target.get(write.key)
+
+    def _unchanged(
+        self,
+        entity_ids: Iterable[str],
+        platform: str | None,
+        items: Mapping[str, bool | float | str],
+    ) -> bool:
+        """Helper-function for the set-functions.
+
+        Return True when the cached entity-data already holds the items: the write would not change anything.
+        """
+        entity_ids = list(entity_ids)
+        for entity_id in entity_ids:
+            entity = cast(dict[str, Any], self.gw_entities.get(entity_id, {}))
+            target = entity if platform is None else entity.get(platform, {})
+            if any(target.get(key) != value for key, value in items.items()):
+                return False
+
+        if entity_ids:
+            LOGGER.debug(
+                "Plugwise: %s of %s unchanged, write skipped",
+                ", ".join(items),
+                ", ".join(entity_ids),
+            )
+        return bool(entity_ids)
+
+    def _update_isolated(
+        self,
+        entities: dict[str, GwEntityData],
+        update: Callable[[str, GwEntityData], None],
+        last_good: Mapping[str, GwEntityData],
+    ) -> None:
+        """Helper-function for _update_gw_entities() and _update_zones().
+
+        Update the data per entity, isolating the failures: a failed entity keeps its last-good data,
+        taken from last_good. Without last-good data the entity is left out.
+        The failures are collected in self._update_errors.
+        """
+        failed: dict[str, GwEntityData | None] = {}
+        for entity_id, entity in entities.items():
+            previous = last_good.get(entity_id)
+            try:
+                update(entity_id, entity)
+            except ENTITY_ERRORS as err:
+                LOGGER.warning(
+                    "Plugwise: failed to update entity %s, error: %r", entity_id, err
+                )
+                self._update_errors.append(
+                    UpdateError(entity_id, repr(err), previous is not None)
+                )
+                failed[entity_id] = previous
+
+        for entity_id, previous in failed.items():
+            if previous is None:
+                del entities[entity_id]
+                continue
+
+            entities[entity_id] = previous
+
+    def _refresh_entity(
+        self,
+        entities: dict[str, GwEntityData],
+        entity_id: str,
+        update: Callable[[str, GwEntityData], None],
+    ) -> None:
+        """Helper-function for async_update_entity() and async_update_zone().
+
+        Re-collect the data of a single entity, starting from its appliance- or zone-info.
+        A failure is isolated like in _update_isolated(), the entity then keeps its current data.
+        The item-count of the latest update is kept.
+        """
+        current = entities[entity_id]
+        refreshed = {entity_id: entity_base_data(current)}
+        count = self._count
+        self._update_errors = [
+            error for error in self._update_errors if error.entity_id != entity_id
+        ]
+        self._update_isolated(refreshed, update, {entity_id: current})
+        self._count = count
+        entities[entity_id] = refreshed[entity_id]
+
+    def _refresh_appliances(
+        self,
+        appliances: set[str],
+        update: Callable[[str, GwEntityData], None],
+    ) -> None:
+        """Helper-function for async_update_entity() and async_refresh_written().
+
+        Re-collect the data of the appliance-entities, update the switching-groups they are a member of.
+        """
+        for entity_id in appliances:
+            self._refresh_entity(self.gw_entities, entity_id, update)
+
+        count = self._count
+        for entity in self.gw_entities.values():
+            if not appliances.isdisjoint(entity.get("members", ())):
+                self._entity_switching_group(entity)
+        self._count = count
+        self._confirm_pending_writes(appliances)
+
+    async def _send_member_writes(
+        self, members: Sequence[str], writes: Mapping[str, Awaitable[None]]
+    ) -> list[str]:
+        """Helper-function for _set_groupswitch_member_state().
+
+        Send the member-writes concurrently, within the concurrent-requests limit of the Gateway.
+        Collect the outcome per member in self._switch_results, a member without a write is skipped.
+        Return the switched members, raise the first error when none of the writes succeeded.
+        """
+        outcomes = await asyncio.gather(*writes.values(), return_exceptions=True)
+        errors = dict(zip(writes, outcomes, strict=True))
+        self._switch_results = []
+        switched: list[str] = []
+        failures: list[PlugwiseException] = []
+        for member in members:
+            if member not in errors:
+                self._switch_results.append(SwitchResult(member, False, None))
+                continue
+
+            if (error := errors[member]) is None:
+                switched.append(member)
+                self._switch_results.append(SwitchResult(member, True, None))
+                continue
+
+            if not isinstance(error, PlugwiseException):
+                raise error
+
+            LOGGER.warning(
+                "Plugwise: failed to switch group-member %s, error: %s", member, error
+            )
+            failures.append(error)
+            self._switch_results.append(SwitchResult(member, False, str(error)))
+
+        if failures and not switched:
+            raise failures[0]
+
+        return switched
+
+    async def _request_element(
+        self, document: etree.Element, endpoint: str, tag: str, element_id: str
+    ) -> None:
+        """Helper-function for async_update_entity() and async_update_zone().
 
-        20251101: modified for finding name = `Smile Anna` in `Smile Anna P1`.
+        Request a single appliance or location, replace it in the document.
         """
-        return bool(name in self.smile.name)
+        result = await self._request(f"{endpoint};id={element_id}")
+        if (element := result.find(f'./{tag}[@id="{element_id}"]')) is None:
+            raise DataMissingError(f"No data for {tag} {element_id}")
+
+        replace_element(document, element)
+
+    def _journal_command(
+        self, uri: str, method: str, data: str | None, writes: list[PendingWrite]
+    ) -> None:
+        """Helper-function for call_request().
+
+        Journal a set-command failing on a connection-error, with its written items, when a journal is present.
+        """
+        if (
+            self._journal is not None
+            and method in ("post", "put")
+            and uri != GATEWAY_REBOOT
+        ):
+            self._journal.add(uri, method, data, writes)
+
+    async def replay_journal(self) -> int:
+        """Replay the journaled set-commands, when connected again.
+
+        Return the number of commands sent.
+        """
+        if self._journal is None:
+            return 0
+
+        return await self._journal.replay(self._send_journaled)
+
+    async def _send_journaled(self, entry: JournalEntry) -> None:
+        """Helper-function for replay_journal().
+
+        The written items of a restored journal are JSON-arrays, converted back to PendingWrites.
+        """
+        await self._request(entry["uri"], method=entry["method"], data=entry["data"])
+        writes = [PendingWrite(*write) for write in entry["writes"]]
+        self._track_write(entry["uri"], writes)
+        self._apply_written(writes)
+
+    def _track_write(self, uri: str, writes: Iterable[PendingWrite]) -> None:
+        """Helper-function for call_request() and _send_journaled().
+
+        Collect the entities written by a set-function, and the written schedule-rule, for async_refresh_written().
+        """
+        self._written.update(write.entity_id for write in writes)
+        endpoint, _, selector = uri.partition(";id=")
+        if endpoint == RULES and selector:
+            self._written_rules.add(selector)
+
+    async def _request_or_reuse(
+        self, endpoint: str, prefetched: dict[str, etree.Element] | None
+    ) -> etree.Element:
+        """Helper-function for full_xml_update().
+
+        Return the document already fetched for the endpoint, request it otherwise.
+        """
+        if (
+            prefetched is not None
+            and (document := prefetched.get(endpoint)) is not None
+        ):
+            return document
+
+        return await self._request(endpoint)
+
+    async def _request_documents(
+        self,
+        endpoints: Sequence[str],
+        prefetched: dict[str, etree.Element] | None = None,
+    ) -> dict[str, etree.Element]:
+        """Helper-function for full_xml_update() and async_update().
+
+        Request the documents concurrently, within the concurrent-requests limit of the Gateway.
+        """
+        documents = await asyncio.gather(
+            *(self._request_or_reuse(endpoint, prefetched) for endpoint in endpoints)
+        )
+        return dict(zip(endpoints, documents, strict=True))
 
     def _appl_heater_central_info(
         self,
@@ -148,8 +799,10 @@ class SmileCommon:
 
     def _create_gw_entities(self, appl: Munch) -> None:
         """Helper-function for creating/updating gw_entities."""
-        self.gw_entities[appl.entity_id] = {"dev_class": appl.pwclass}
+        entity: GwEntityData = {"dev_class": appl.pwclass}
         self._count += 1
+        if appl.location is not None:
+            appl.location = sys.intern(appl.location)
         for key, value in {
             "available": appl.available,
             "firmware": appl.firmware,
@@ -164,18 +817,10 @@ class SmileCommon:
         }.items():
             if value is not None or key == "location":
                 appl_key = cast(ApplianceType, key)
-                self.gw_entities[appl.entity_id][appl_key] = value
+                entity[appl_key] = value
                 self._count += 1
 
-    def _reorder_devices(self) -> None:
-        """Place the gateway and optional heater_central devices as 1st and 2nd."""
-        reordered = {}
-        for dev_class in PRIORITY_DEVICE_CLASSES:
-            for entity_id, entity in dict(self.gw_entities).items():
-                if entity["dev_class"] == dev_class:
-                    reordered[entity_id] = self.gw_entities.pop(entity_id)
-                    break
-        self.gw_entities = {**reordered, **self.gw_entities}
+        self.gw_entities[sys.intern(appl.entity_id)] = entity
 
     def _entity_switching_group(self, entity: GwEntityData) -> None:
         """Helper-function for _get_device_zone_data().
@@ -183,11 +828,10 @@ class SmileCommon:
         Determine switching group device data.
         """
         if entity["dev_class"] in SWITCH_GROUP_TYPES:
-            counter = 0
-            for member in entity["members"]:
-                if self.gw_entities[member]["switches"].get("relay"):
-                    counter += 1
-            entity["switches"]["relay"] = counter != 0
+            entity["switches"]["relay"] = any(
+                self.gw_entities[member]["switches"].get("relay")
+                for member in entity["members"]
+            )
             self._count += 1
 
     def _get_groups(self) -> None:
@@ -196,7 +840,7 @@ class SmileCommon:
         Collect switching-, pumping- or report-group info.
         """
         # P1 and Anna don't have groups
-        if self.smile.type == "power" or self.check_name(ANNA):
+        if not self._plan.groups:
             return
 
         for group in self._domain_objects.findall("./group"):
@@ -225,7 +869,7 @@ class SmileCommon:
         group_appliances = element.findall("appliances/appliance")
         for item in group_appliances:
             if (member_id := item.get("id")) in self.gw_entities:
-                members.append(member_id)
+                members.append(sys.intern(member_id))
 
         return members
 
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from collections import namedtuple
+from collections.abc import Callable
 import logging
-from typing import Final, Literal, TypedDict, get_args
+from typing import Final, Literal, NamedTuple, TypedDict, get_args
 
 LOGGER = logging.getLogger(__name__)
 
@@ -111,6 +112,23 @@ RULES: Final = "/core/rules"
 SYSTEM: Final = "/system"
 STATUS: Final = "/system/status.xml"
 
+# Gateway requests and set-commands
+# The maximum number of concurrent requests to a single gateway
+MAX_CONCURRENT_REQUESTS: Final = 4
+# The time, in seconds, a written value may take to show in the entity-data
+ACTUATION_TIMEOUT: Final = 600.0
+# The number of actuation-latencies kept per written item
+LATENCY_SAMPLES: Final = 100
+# The kinds of changes supported by apply_scene()
+SCENE_CHANGES: Final = (
+    "gateway_mode",
+    "preset",
+    "regulation_mode",
+    "schedule",
+    "temperature",
+    "temperature_offset",
+)
+
 UOM = namedtuple("UOM", "unit_of_measurement")
 DATA = namedtuple("DATA", "name unit_of_measurement")
 
@@ -300,6 +318,12 @@ ApplianceType = Literal[
     "vendor",
     "zigbee_mac_address",
 ]
+# The entity-items collected from the appliance- or zone-info, kept when refreshing a single entity
+ENTITY_BASE_ITEMS: Final[tuple[str, ...]] = (
+    "available",
+    *get_args(ApplianceType),
+    "thermostats",
+)
 
 BinarySensorType = Literal[
     "compressor_state",
@@ -520,6 +544,185 @@ class ThermoLoc(TypedDict, total=False):
     secondary: list[str]
 
 
+PlatformType = Literal[
+    "binary_sensors",
+    "entity",
+    "sensors",
+    "switches",
+]
+
+
+class MeasurementDispatch(NamedTuple):
+    """Compiled handling of a single measurement type.
+
+    Maps the measurement to its output key, its target platform dict
+    (entity for a top-level item, None when not stored) and a converter
+    pre-bound to the unit of measurement.
+    """
+
+    key: str
+    platform: PlatformType | None
+    convert: Callable[[str], bool | float | int]
+    low_battery: bool
+
+
+class NotificationIndex(NamedTuple):
+    """The Plugwise notifications classified per kind, built once per update."""
+
+    # zigbee_mac_address: notification-id, for the Battery-is-low notifications
+    low_battery: dict[str, str]
+    lost_opentherm: bool
+    lost_p1: bool
+
+
+class UpdateError(NamedTuple):
+    """A failed entity-update, collected per update."""
+
+    entity_id: str
+    error: str
+    # True when the last-good data is kept, the entity is left out otherwise
+    stale: bool
+
+
+class PendingWrite(NamedTuple):
+    """A written value applied to the cached entity-data, pending until the next update."""
+
+    entity_id: str
+    # The platform-dict holding the item, None for an entity-item
+    platform: str | None
+    key: str
+    value: bool | float | str
+
+
+class Actuation(NamedTuple):
+    """A write accepted by the gateway, awaiting its value to show in the entity-data."""
+
+    write: PendingWrite
+    # The acceptance-time, time.monotonic() in seconds
+    accepted: float
+
+
+class LatencyStats(NamedTuple):
+    """The actuation-latency distribution of a written item, in seconds."""
+
+    # The target_smile of the gateway, e.g. smile_open_therm_v3
+    gateway_type: str
+    samples: int
+    minimum: float
+    median: float
+    p95: float
+    maximum: float
+
+
+class SceneChange(NamedTuple):
+    """A single change of a scene, applied by apply_scene()."""
+
+    # One of SCENE_CHANGES
+    kind: str
+    # The zone- or location-id, the entity-id for the gateway-modes and the temperature-offset
+    target: str
+    # The preset, mode, schedule-state, offset or the setpoint-items
+    value: str | float | dict[str, float]
+    # The schedule-name, None for the last-used schedule
+    name: str | None = None
+
+
+class SceneResult(NamedTuple):
+    """The outcome of a single change of a scene."""
+
+    change: SceneChange
+    # The error of a failed change, None when applied
+    error: str | None
+
+
+class SwitchResult(NamedTuple):
+    """The outcome of the write to a member of a switching-group."""
+
+    entity_id: str
+    switched: bool
+    # The error of a failed write, None when switched or skipped (locked)
+    error: str | None
+
+
+class ExtractionPlan(NamedTuple):
+    """Gateway-type specific extraction plan, compiled once in connect().
+
+    Lists which update-steps apply to which dev_class for the detected gateway,
+    so the per-update path does not have to re-derive the gateway capabilities.
+    """
+
+    adam: bool
+    anna: bool
+    power: bool
+    thermostat: bool
+    # Smartmeter data is collected from the Home location (P1, Anna P1)
+    smartmeter_location: bool
+    # P1: only smartmeter data, skip all other steps
+    power_only: bool
+    # Collect and show the Plugwise notifications on the gateway
+    notifications: bool
+    # Collect switching-, pumping- and report-groups
+    groups: bool
+    # The dev_class carrying the thermostat actuator: climate-zones for Adam
+    zone_class: str
+    # The dev_class receiving climate-, control_state- and cooling-data (Anna)
+    climate_class: str | None
+    # The measurements to collect for the active heater_central
+    heater_measurements: dict[str, MeasurementDispatch]
+
+
+class GatewayTopology(TypedDict):
+    """The legacy gateway topology, as collected by the latest full-update.
+
+    JSON-serializable, part of the GatewayProfile.
+    """
+
+    # The appliance- and group-info per entity, see ENTITY_BASE_ITEMS
+    entities: dict[str, GwEntityData]
+    # Hash of the documents requested by an incremental update, see topology_fingerprint()
+    fingerprint: str
+    gateway_id: str
+    heater_id: str
+    home_loc_id: str
+    loc_data: dict[str, ThermoLoc]
+
+
+class GatewayProfile(TypedDict):
+    """The gateway profile, as determined in connect().
+
+    JSON-serializable, for a warm-start of connect() without detection.
+    """
+
+    cooling_present: bool
+    elga: bool
+    # Hash of the gateway topology, see topology_fingerprint()
+    fingerprint: str
+    is_thermostat: bool
+    on_off_device: bool
+    opentherm_device: bool
+    # The smile-data, with the version as string
+    smile: dict[str, bool | str | None]
+    stretch_v2: bool
+    target_smile: str
+    # The legacy topology, None for the non-legacy Gateways re-collecting the entities every update
+    topology: GatewayTopology | None
+
+
+class JournalEntry(TypedDict):
+    """A set-command not sent due to a connection-failure, see CommandJournal.
+
+    JSON-serializable, for persisting the journal.
+    """
+
+    data: str | None
+    # The expiry-time, in seconds since the epoch
+    expires: float
+    method: str
+    uri: str
+    # The items written by the command, for the actuation-latency
+    writes: list[PendingWrite]
+
+
 class ActuatorData(TypedDict, total=False):
     """Actuator data for thermostat types."""
 
@@ -5,11 +5,7 @@ Plugwise Smile protocol data-collection helpers.
 
 from __future__ import annotations
 
-import re
-
 from plugwise.constants import (
-    ADAM,
-    ANNA,
     MAX_SETPOINT,
     MIN_SETPOINT,
     OFF,
@@ -19,6 +15,8 @@ from plugwise.constants import (
 from plugwise.helper import SmileHelper
 from plugwise.util import remove_empty_platform_dicts
 
+from munch import Munch
+
 
 class SmileData(SmileHelper):
     """The Plugwise Smile main class."""
@@ -33,82 +31,88 @@ class SmileData(SmileHelper):
 
         Collect data for each entity and add to self.gw_entities.
         """
+        self._collect_aggregates()
         self._update_gw_entities()
-        if self.check_name(ADAM):
+        if self._plan.adam:
             self._update_zones()
-            self.gw_entities.update(self._zones)
+            for location_id, zone in self._zones.items():
+                self.gw_entities[location_id] = zone
+
+    def _collect_aggregates(self) -> None:
+        """Helper-function for _all_entity_data().
+
+        Init the gateway-wide values, collected once per update, used by the entity- and zone-data collection.
+        The heater binary_sensor states and the regulation_mode are filled in when the related entity is processed.
+        """
+        self._aggregates = Munch()
+        self._aggregates.cooling_state = False
+        self._aggregates.heating_state = False
+        self._aggregates.open_valves = False
+        self._aggregates.regulation_mode = None
+        if self._plan.adam and self._on_off_device:
+            self._aggregates.open_valves = self._heating_valves()
 
     def _update_zones(self) -> None:
         """Helper-function for _all_entity_data() and async_update().
 
         Collect data for each zone/location and add to self._zones.
         """
-        for location_id, zone in self._zones.items():
-            self._get_location_data(location_id, zone)
+        self._update_isolated(
+            self._zones, self._get_location_data, self._previous_entities
+        )
 
     def _update_gw_entities(self) -> None:
         """Helper-function for _all_entities_data() and async_update().
 
         Collect data for each entity and add to self.gw_entities.
         """
-        mac_list: list[str] = []
-        for entity_id, entity in self.gw_entities.items():
-            self._get_entity_data(entity_id, entity)
-            if entity_id == self._gateway_id:
-                mac_list = self._detect_low_batteries()
-                self._add_or_update_notifications(entity_id, entity)
-
-            is_battery_low = (
-                mac_list
-                and "low_battery" in entity["binary_sensors"]
-                and entity["zigbee_mac_address"] in mac_list
-                and entity["dev_class"]
-                in (
-                    "thermo_sensor",
-                    "thermostatic_radiator_valve",
-                    "zone_thermometer",
-                    "zone_thermostat",
-                )
-            )
-            if is_battery_low:
-                entity["binary_sensors"]["low_battery"] = True
+        self._update_isolated(
+            self.gw_entities, self._update_entity, self._previous_entities
+        )
 
-            self._update_for_cooling(entity)
+    def _update_entity(self, entity_id: str, entity: GwEntityData) -> None:
+        """Helper-function for _update_gw_entities().
 
-            remove_empty_platform_dicts(entity)
+        Collect the data for a single entity.
+        """
+        self._get_entity_data(entity_id, entity)
+        if entity_id == self._heater_id:
+            binary_sensors = entity["binary_sensors"]
+            self._aggregates.heating_state = binary_sensors.get("heating_state")
+            self._aggregates.cooling_state = binary_sensors.get("cooling_state")
+        if entity_id == self._gateway_id:
+            self._add_or_update_notifications(entity_id, entity)
 
-            # Replace select_dhw_mode with dhw_mode when applicable
-            if (
-                "max_dhw_temperature" in entity
-                and (mode := entity.get("select_dhw_mode")) is not None
-            ):
-                entity.pop("select_dhw_mode")
-                entity["dhw_mode"] = mode
-
-    def _detect_low_batteries(self) -> list[str]:
-        """Helper-function updating the low-battery binary_sensor status from a Battery-is-low message."""
-        mac_address_list: list[str] = []
-        mac_pattern = re.compile(r"(?:[0-9A-F]{2}){8}")
-        matches = ["Battery", "below"]
-        if self._notifications:
-            for msg_id, notification in self._notifications.copy().items():
-                mac_address: str | None = None
-                message: str | None = notification.get("message")
-                warning: str | None = notification.get("warning")
-                notify = message or warning
-                if (
-                    notify is not None
-                    and all(x in notify for x in matches)
-                    and (mac_addresses := mac_pattern.findall(notify))
-                ):
-                    mac_address = mac_addresses[0]  # re.findall() outputs a list
-
-                if mac_address is not None:
-                    mac_address_list.append(mac_address)
-                    if message is not None:  # only block message-type notifications
-                        self._notifications.pop(msg_id)
-
-        return mac_address_list
+        self._update_for_cooling(entity)
+        self._update_low_battery(entity)
+
+        remove_empty_platform_dicts(entity)
+
+        # Replace select_dhw_mode with dhw_mode when applicable
+        if (
+            "max_dhw_temperature" in entity
+            and (mode := entity.get("select_dhw_mode")) is not None
+        ):
+            entity.pop("select_dhw_mode")
+            entity["dhw_mode"] = mode
+
+    def _update_low_battery(self, entity: GwEntityData) -> None:
+        """Helper-function for _update_entity().
+
+        Set the low_battery binary_sensor of a battery-powered entity with a low-battery notification.
+        """
+        if (
+            entity.get("zigbee_mac_address") in self._notification_index.low_battery
+            and "low_battery" in entity.get("binary_sensors", {})
+            and entity["dev_class"]
+            in (
+                "thermo_sensor",
+                "thermostatic_radiator_valve",
+                "zone_thermometer",
+                "zone_thermostat",
+            )
+        ):
+            entity["binary_sensors"]["low_battery"] = True
 
     def _add_or_update_notifications(
         self, entity_id: str, entity: GwEntityData
@@ -118,7 +122,7 @@ class SmileData(SmileHelper):
         if entity_id != self._gateway_id:
             return  # pragma: no cover
 
-        if self._is_thermostat or self.smile.type == "power":
+        if self._plan.notifications:
             if "plugwise_notification" not in entity["binary_sensors"]:
                 entity["binary_sensors"].update(
                     {"plugwise_notification": bool(self._notifications)}
@@ -129,11 +133,7 @@ class SmileData(SmileHelper):
     def _update_for_cooling(self, entity: GwEntityData) -> None:
         """Helper-function for adding/updating various cooling-related values."""
         # For Anna and heating + cooling, replace setpoint with setpoint_high/_low
-        if (
-            self.check_name(ANNA)
-            and self._cooling_present
-            and entity["dev_class"] == "thermostat"
-        ):
+        if entity["dev_class"] == self._plan.climate_class and self._cooling_present:
             thermostat = entity["thermostat"]
             temp_dict: ActuatorData = {
                 "setpoint_low": thermostat["setpoint"],
@@ -191,42 +191,35 @@ class SmileData(SmileHelper):
         """
         self._get_measurement_data(entity_id, entity)
         # Adam data
-        if self.check_name(ADAM):
+        if self._plan.adam:
             self._get_adam_data(entity)
             # Update switching-group status
             self._entity_switching_group(entity)
 
         # Thermostat data for Anna (presets, temperatures etc)
-        if self.check_name(ANNA) and entity["dev_class"] == "thermostat":
+        if entity["dev_class"] == self._plan.climate_class:
             self._climate_data(entity_id, entity)
             self._get_anna_control_state(entity)
 
         # Check availability of wired entities:
         # - Smartmeter
-        self._check_availability(
-            entity, "smartmeter", "P1 does not seem to be connected"
-        )
+        self._check_availability(entity, "smartmeter", self._notification_index.lost_p1)
         # - OpenTherm entity
         if entity["name"] != "OnOff":
             self._check_availability(
-                entity, "heater_central", "no OpenTherm communication"
+                entity, "heater_central", self._notification_index.lost_opentherm
             )
 
     def _check_availability(
-        self, entity: GwEntityData, dev_class: str, message: str
+        self, entity: GwEntityData, dev_class: str, lost: bool
     ) -> None:
         """Helper-function for _get_entity_data().
 
         Provide availability status for the wired-connected devices.
         """
         if entity["dev_class"] == dev_class:
-            entity["available"] = True
+            entity["available"] = not lost
             self._count += 1
-            for item in self._notifications.values():
-                for msg in item.values():
-                    if message in msg:
-                        entity["available"] = False
-                        break
 
     def _get_adam_data(self, entity: GwEntityData) -> None:
         """Helper-function for _get_entity_data().
@@ -237,8 +230,10 @@ class SmileData(SmileHelper):
         """
         if entity["dev_class"] == "heater_central":
             # Indicate heating_state based on valves being open in case of city-provided heating
-            if self._on_off_device and isinstance(self._heating_valves(), int):
-                entity["binary_sensors"]["heating_state"] = self._heating_valves() != 0
+            if self._on_off_device and isinstance(
+                open_valves := self._aggregates.open_valves, int
+            ):
+                entity["binary_sensors"]["heating_state"] = open_valves != 0
             # Add cooling_enabled binary_sensor
             if (
                 "binary_sensors" in entity
@@ -302,24 +297,17 @@ class SmileData(SmileHelper):
 
     def check_reg_mode(self, mode: str) -> bool:
         """Helper-function for device_data_climate()."""
-        gateway = self.gw_entities[self._gateway_id]
-        return (
-            "regulation_modes" in gateway and gateway["select_regulation_mode"] == mode
-        )
+        regulation_mode: str | None = self._aggregates.regulation_mode
+        return regulation_mode == mode
 
     def _get_anna_control_state(self, data: GwEntityData) -> None:
         """Set the thermostat control_state based on the opentherm/onoff device state."""
         data["control_state"] = "idle"
         self._count += 1
-        for entity in self.gw_entities.values():
-            if entity["dev_class"] != "heater_central":
-                continue
-
-            binary_sensors = entity["binary_sensors"]
-            if binary_sensors["heating_state"]:
-                data["control_state"] = "heating"
-            if binary_sensors.get("cooling_state"):
-                data["control_state"] = "cooling"
+        if self._aggregates.heating_state:
+            data["control_state"] = "heating"
+        if self._aggregates.cooling_state:
+            data["control_state"] = "cooling"
 
     def _get_schedule_states_with_off(
         self, location: str, schedules: list[str], selected: str, entity: GwEntityData
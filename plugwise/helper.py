@@ -12,16 +12,9 @@ from plugwise.constants import (
     ACTIVE_ACTUATORS,
     ACTIVE_KEYS,
     ACTUATOR_CLASSES,
-    ADAM,
     ALLOWED_ZONE_PROFILES,
-    ANNA,
-    ATTR_NAME,
-    DATA,
-    DEVICE_MEASUREMENTS,
     DOMAIN_OBJECTS,
     ENERGY_WATT_HOUR,
-    GROUP_MEASUREMENTS,
-    HEATER_CENTRAL_MEASUREMENTS,
     LOCATIONS,
     LOGGER,
     MODULE_LOCATOR,
@@ -32,23 +25,28 @@ from plugwise.constants import (
     THERMO_MATCHING,
     THERMOSTAT_CLASSES,
     TOGGLES,
-    UOM,
-    ZONE_MEASUREMENTS,
     ActuatorData,
     ActuatorDataType,
     ActuatorType,
     GwEntityData,
+    MeasurementDispatch,
+    NotificationIndex,
     SensorType,
     ThermoLoc,
     ToggleNameType,
 )
 from plugwise.util import (
+    DEVICE_DISPATCH,
+    GROUP_DISPATCH,
+    ZONE_DISPATCH,
     check_model,
-    collect_power_values,
-    common_match_cases,
     count_data_items,
     format_measure,
+    index_power_logs,
+    low_battery_mac,
     skip_obsolete_measurements,
+    store_measurement,
+    store_power_value,
 )
 
 from defusedxml import ElementTree as etree
@@ -84,15 +82,15 @@ class SmileHelper(SmileCommon):
     def __init__(self) -> None:
         """Set the constructor for this class."""
         super().__init__()
+        self._aggregates: Munch = Munch()
         self._endpoint: str
         self._elga: bool
         self._dhw_allowed_modes: list[str] | None = None
-        self._is_thermostat: bool
         self._loc_data: dict[str, ThermoLoc]
         self._schedule_old_states: dict[str, dict[str, str]]
         self._gateway_id: str = NONE
+        self._notification_index: NotificationIndex
         self._zones: dict[str, GwEntityData]
-        self.gw_entities: dict[str, GwEntityData]
         self.smile: Munch = Munch()
 
     @property
@@ -158,12 +156,9 @@ class SmileHelper(SmileCommon):
             self._create_gw_entities(appl)
 
         # A smartmeter is not present as an appliance, add it specifically
-        if self.smile.type == "power" or self.smile.anna_p1:
+        if self._plan.smartmeter_location:
             self._get_p1_smartmeter_info()
 
-        # Sort the gw_entities
-        self._reorder_devices()
-
     def _get_p1_smartmeter_info(self) -> None:
         """For P1 collect the connected SmartMeter info from the Home/building location.
 
@@ -195,7 +190,7 @@ class SmileHelper(SmileCommon):
 
         # Replace the entity_id of the gateway by the smartmeter location_id
         if not self.smile.anna_p1:
-            self.gw_entities[self._home_loc_id] = self.gw_entities.pop(self._gateway_id)
+            self.gw_entities.rename(self._gateway_id, self._home_loc_id)
             self._gateway_id = self._home_loc_id
 
         self._create_gw_entities(appl)
@@ -289,7 +284,7 @@ class SmileHelper(SmileCommon):
         appl.vendor_name = "Plugwise"
 
         # Adam: collect the ZigBee MAC address of the Smile
-        if self.check_name(ADAM):
+        if self._plan.adam:
             if (
                 found := self._domain_objects.find(".//protocols/zig_bee_coordinator")
             ) is not None:
@@ -328,7 +323,7 @@ class SmileHelper(SmileCommon):
         Collect the location/zone-data based on location id.
         """
         data: GwEntityData = {"sensors": {}}
-        measurements = ZONE_MEASUREMENTS
+        measurements = ZONE_DISPATCH
         if (
             location := self._domain_objects.find(f'./location[@id="{loc_id}"]')
         ) is not None:
@@ -345,23 +340,21 @@ class SmileHelper(SmileCommon):
         data: GwEntityData = {"binary_sensors": {}, "sensors": {}, "switches": {}}
 
         # Get P1 smartmeter data from LOCATIONS
-        is_smartmeter = entity.get("dev_class") == "smartmeter"
-        smile_is_power = self.smile.type == "power"
-        if is_smartmeter and (smile_is_power or self.smile.anna_p1):
+        if self._plan.smartmeter_location and entity.get("dev_class") == "smartmeter":
             data.update(self._power_data_from_location())
 
-        if smile_is_power and not self.smile.anna_p1:
+        if self._plan.power_only:
             entity.update(data)
             return
 
         # Get group data
         if "members" in entity:
-            self._collect_group_sensors(data, entity_id, GROUP_MEASUREMENTS)
+            self._collect_group_sensors(data, entity_id, GROUP_DISPATCH)
 
         # Get non-P1 data from APPLIANCES
-        measurements = DEVICE_MEASUREMENTS
-        if self._is_thermostat and entity_id == self.heater_id:
-            measurements = HEATER_CENTRAL_MEASUREMENTS
+        measurements = DEVICE_DISPATCH
+        if entity_id == self._heater_id:
+            measurements = self._plan.heater_measurements
             # Show the available dhw_modes
             if self._dhw_allowed_modes:
                 data["dhw_modes"] = self._dhw_allowed_modes
@@ -382,7 +375,7 @@ class SmileHelper(SmileCommon):
             data.pop("c_heating_state")
             self._count -= 1
 
-        if self._is_thermostat and self.check_name(ANNA):
+        if self._plan.anna:
             self._update_anna_cooling(entity_id, data)
 
         self._cleanup_data(data)
@@ -393,18 +386,18 @@ class SmileHelper(SmileCommon):
         self,
         data: GwEntityData,
         group_id: str,
-        measurements: dict[str, UOM],
+        measurements: dict[str, MeasurementDispatch],
     ) -> None:
         """Collect group sensors."""
         if (
             group := self._domain_objects.find(f'./group[@id="{group_id}"]')
         ) is not None:
-            for measurement, attrs in measurements.items():
+            for measurement, dispatch in measurements.items():
                 locator = f'.//logs/point_log[type="{measurement}"]/period/measurement'
                 if (group_meas_loc := group.find(locator)) is None:
                     continue
 
-                common_match_cases(measurement, attrs, group_meas_loc, data)
+                store_measurement(dispatch, group_meas_loc.text, data)
                 self._count += 1
 
     def _collect_appliance_data(
@@ -412,7 +405,7 @@ class SmileHelper(SmileCommon):
         data: GwEntityData,
         entity: GwEntityData,
         entity_id: str,
-        measurements: dict[str, DATA | UOM],
+        measurements: dict[str, MeasurementDispatch],
     ) -> etree.Element | None:
         """Collect initial appliance data."""
         if (
@@ -438,14 +431,29 @@ class SmileHelper(SmileCommon):
         Collect the power-data from the Home location.
         """
         data: GwEntityData = {"sensors": {}}
-        loc = Munch()
         log_list: list[str] = ["point_log", "cumulative_log", "interval_log"]
-        t_string = "tariff"
 
-        loc.logs = self._home_location.find("./logs")
-        for loc.measurement, loc.attrs in P1_MEASUREMENTS.items():
-            for loc.log_type in log_list:
-                collect_power_values(data, loc, t_string)
+        index = index_power_logs(self._home_location.find("./logs"))
+        for measurement in P1_MEASUREMENTS:
+            # P1 gas_consumed or phase data come without tariff
+            no_tariff = "gas" in measurement or "phase" in measurement
+            for log_type in log_list:
+                for peak_select in ("nl_peak", "nl_offpeak"):
+                    if (val := index.get((measurement, log_type, peak_select))) is None:
+                        # Avoid double processing by skipping one peak-list option
+                        if not no_tariff or peak_select == "nl_offpeak":
+                            continue
+                        if (val := index.get((measurement, log_type, None))) is None:
+                            continue
+
+                    store_power_value(
+                        data,
+                        measurement,
+                        log_type,
+                        peak_select,
+                        val,
+                        measurements=P1_MEASUREMENTS,
+                    )
 
         self._count += len(data["sensors"])
         return data
@@ -454,26 +462,24 @@ class SmileHelper(SmileCommon):
         self,
         appliance: etree.Element,
         data: GwEntityData,
-        measurements: dict[str, DATA | UOM],
+        measurements: dict[str, MeasurementDispatch],
     ) -> None:
         """Helper-function for _get_measurement_data() - collect appliance measurement data."""
-        for measurement, attrs in measurements.items():
+        for measurement, dispatch in measurements.items():
             p_locator = f'.//logs/point_log[type="{measurement}"]/period/measurement'
             if (appl_p_loc := appliance.find(p_locator)) is not None:
                 if skip_obsolete_measurements(appliance, measurement):
                     continue
 
                 old_measurement = measurement
-                if new_name := getattr(attrs, ATTR_NAME, None):
-                    measurement = new_name
-
+                measurement = dispatch.key
                 match measurement:
                     case "elga_status_code":
                         data["elga_status_code"] = int(appl_p_loc.text)
                     case "select_dhw_mode":
                         self._select_dhw_mode(appl_p_loc.text, data, old_measurement)
 
-                common_match_cases(measurement, attrs, appl_p_loc, data)
+                store_measurement(dispatch, appl_p_loc.text, data)
 
             i_locator = f'.//logs/interval_log[type="{measurement}"]/period/measurement'
             if (appl_i_loc := appliance.find(i_locator)) is not None:
@@ -512,20 +518,40 @@ class SmileHelper(SmileCommon):
                     self._dhw_allowed_modes = ["comfort", "eco"]
 
     def _get_plugwise_notifications(self) -> None:
-        """Collect the Plugwise notifications."""
+        """Collect the Plugwise notifications, classify each notification once.
+
+        Battery-is-low messages are indexed by zigbee_mac_address and not shown as a notification.
+        """
         self._notifications = {}
+        low_battery: dict[str, str] = {}
+        lost_opentherm = lost_p1 = False
         for notification in self._domain_objects.findall("./notification"):
             try:
                 msg_id = notification.get("id")
                 msg_type = notification.find("type").text
                 msg = notification.find("message").text
-                self._notifications[msg_id] = {msg_type: msg}
-                LOGGER.debug("Plugwise notifications: %s", self._notifications)
             except AttributeError:  # pragma: no cover
                 LOGGER.debug(
                     "Plugwise notification present but unable to process, manually investigate: %s",
                     f"{self._endpoint}{DOMAIN_OBJECTS}",
                 )
+                continue
+
+            if (mac_address := low_battery_mac(msg_type, msg)) is not None:
+                low_battery[mac_address] = msg_id
+                if msg_type == "message":  # only block message-type notifications
+                    continue
+
+            if msg is not None:
+                lost_opentherm |= "no OpenTherm communication" in msg
+                lost_p1 |= "P1 does not seem to be connected" in msg
+
+            self._notifications[msg_id] = {msg_type: msg}
+            LOGGER.debug("Plugwise notifications: %s", self._notifications)
+
+        self._notification_index = NotificationIndex(
+            low_battery, lost_opentherm, lost_p1
+        )
 
     def _get_actuator_functionalities(
         self, xml: etree.Element, entity: GwEntityData, data: GwEntityData
@@ -538,12 +564,7 @@ class SmileHelper(SmileCommon):
             # Skip max_dhw_temperature, not initially valid,
             # skip thermostat for all but zones with thermostats
             if item == "max_dhw_temperature" or (
-                item == "thermostat"
-                and (
-                    entity["dev_class"] != "climate"
-                    if self.check_name(ADAM)
-                    else entity["dev_class"] != "thermostat"
-                )
+                item == "thermostat" and entity["dev_class"] != self._plan.zone_class
             ):
                 continue
 
@@ -594,7 +615,7 @@ class SmileHelper(SmileCommon):
 
         Collect the requested gateway mode.
         """
-        if not (entity_id == self._gateway_id and self.check_name(ADAM)):
+        if not (self._plan.adam and entity_id == self._gateway_id):
             return None
 
         if (search := search_actuator_functionalities(appliance, key)) is not None:
@@ -618,6 +639,7 @@ class SmileHelper(SmileCommon):
             self._cooling_enabled = mode == "cooling"
             if self._reg_allowed_modes:
                 data["select_regulation_mode"] = mode
+                self._aggregates.regulation_mode = mode
                 self._count += 1
 
     def _get_gateway_mode(
@@ -637,7 +659,7 @@ class SmileHelper(SmileCommon):
 
     def _get_gateway_outdoor_temp(self, entity_id: str, data: GwEntityData) -> None:
         """Adam & Anna: the Smile outdoor_temperature is present in the Home location."""
-        if self._is_thermostat and entity_id == self._gateway_id:
+        if self._plan.thermostat and entity_id == self._gateway_id:
             locator = "./logs/point_log[type='outdoor_temperature']/period/measurement"
             if (found := self._home_location.find(locator)) is not None:
                 value = format_measure(found.text, NONE)
@@ -662,10 +684,10 @@ class SmileHelper(SmileCommon):
 
         Solution for Core issue #81839.
         """
-        if self.check_name(ANNA):
+        if self._plan.anna:
             data["binary_sensors"]["heating_state"] = data["c_heating_state"]
 
-        if self.check_name(ADAM):
+        if self._plan.adam:
             # First count when not present, then create and init to False.
             # When present init to False
             if "heating_state" not in data["binary_sensors"]:
@@ -767,7 +789,7 @@ class SmileHelper(SmileCommon):
         Adam only: update locations with thermostat ranking results and use
         the result to update the device_class of secondary thermostats.
         """
-        if not self.check_name(ADAM):
+        if not self._plan.adam:
             return
 
         self._match_and_rank_thermostats()
@@ -792,9 +814,13 @@ class SmileHelper(SmileCommon):
         """
         for location_id, location in self._loc_data.items():
             location.update({"primary": [], "primary_prio": 0, "secondary": []})
-            for entity_id, entity in self.gw_entities.items():
+            for entity_id in self.gw_entities.by_location(location_id):
                 self._rank_thermostat(
-                    entity_id, entity, location_id, location, THERMO_MATCHING
+                    entity_id,
+                    self.gw_entities[entity_id],
+                    location_id,
+                    location,
+                    THERMO_MATCHING,
                 )
 
     def _rank_thermostat(
@@ -862,7 +888,7 @@ class SmileHelper(SmileCommon):
         return False  # pragma: no cover
 
     def _heating_valves(self) -> int | bool:
-        """Helper-function for smile.py: _get_adam_data().
+        """Helper-function for data.py: _collect_aggregates().
 
         Collect amount of open valves indicating active direct heating.
         For cases where the heat is provided from an external shared source (city heating).
@@ -5,6 +5,8 @@ Plugwise Smile protocol data-collection helpers for legacy devices.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 # Dict as class
 # Version detection
 from plugwise.constants import OFF, GwEntityData
@@ -20,16 +22,35 @@ class SmileLegacyData(SmileLegacyHelper):
 
         Collect data for each entity and add to self.gw_entities.
         """
-        self._update_gw_entities()
+        self._update_gw_entities(self._previous_entities)
 
-    def _update_gw_entities(self) -> None:
+    def _update_gw_entities(self, last_good: Mapping[str, GwEntityData]) -> None:
         """Helper-function for _all_entity_data() and async_update().
 
         Collect data for each entity and add to self.gw_entities.
+        The last-good data is taken from the previous entities.
+        """
+        self._update_isolated(self.gw_entities, self._update_entity, last_good)
+
+    def _update_entity(self, entity_id: str, entity: GwEntityData) -> None:
+        """Helper-function for _update_gw_entities().
+
+        Collect the data for a single entity.
         """
-        for entity_id, entity in self.gw_entities.items():
-            self._get_entity_data(entity_id, entity)
-            remove_empty_platform_dicts(entity)
+        self._get_entity_data(entity_id, entity)
+        remove_empty_platform_dicts(entity)
+
+    def _refresh_entity_data(self, entity_id: str, entity: GwEntityData) -> None:
+        """Helper-function for async_update_entity() and async_refresh_written().
+
+        Collect the data for a single entity, keeping the schedule-data of the latest update:
+        the schedule-state is collected from DOMAIN_OBJECTS, not requested by a refresh.
+        """
+        self._update_entity(entity_id, entity)
+        if entity["dev_class"] == self._plan.climate_class:
+            current = self.gw_entities[entity_id]
+            for key in ("available_schedules", "select_schedule", "climate_mode"):
+                entity[key] = current[key]
 
     def _get_entity_data(self, entity_id: str, entity: GwEntityData) -> None:
         """Helper-function for _all_entity_data() and async_update().
@@ -42,7 +63,7 @@ class SmileLegacyData(SmileLegacyHelper):
         self._entity_switching_group(entity)
 
         # Skip obtaining data when not a thermostat
-        if entity["dev_class"] != "thermostat":
+        if entity["dev_class"] != self._plan.climate_class:
             return
 
         # Thermostat data (presets, temperatures etc)
@@ -81,10 +102,7 @@ class SmileLegacyData(SmileLegacyHelper):
         """Set the thermostat control_state based on the opentherm/onoff device state."""
         entity["control_state"] = "idle"
         self._count += 1
-        for device in self.gw_entities.values():
-            if device["dev_class"] != "heater_central":
-                continue
-
-            binary_sensors = device["binary_sensors"]
+        for heater_id in self.gw_entities.by_class("heater_central"):
+            binary_sensors = self.gw_entities[heater_id]["binary_sensors"]
             if binary_sensors["heating_state"]:
                 entity["control_state"] = "heating"
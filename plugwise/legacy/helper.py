@@ -13,33 +13,31 @@ from plugwise.constants import (
     ACTIVE_KEYS,
     ACTUATOR_CLASSES,
     APPLIANCES,
-    ATTR_NAME,
-    DATA,
-    DEVICE_MEASUREMENTS,
     ENERGY_WATT_HOUR,
     FAKE_APPL,
     FAKE_LOC,
-    HEATER_CENTRAL_MEASUREMENTS,
     NONE,
     OFF,
     P1_LEGACY_MEASUREMENTS,
     TEMP_CELSIUS,
     THERMOSTAT_CLASSES,
-    UOM,
     ActuatorData,
     ActuatorDataType,
     ActuatorType,
     ApplianceType,
     GwEntityData,
+    MeasurementDispatch,
     SensorType,
     ThermoLoc,
 )
 from plugwise.util import (
-    collect_power_values,
-    common_match_cases,
+    DEVICE_DISPATCH,
     count_data_items,
     format_measure,
+    index_power_services,
     skip_obsolete_measurements,
+    store_measurement,
+    store_power_value,
     version_to_model,
 )
 
@@ -65,12 +63,10 @@ class SmileLegacyHelper(SmileCommon):
         super().__init__()
         self._appliances: etree.Element
         self._gateway_id: str = NONE
-        self._is_thermostat: bool
         self._loc_data: dict[str, ThermoLoc]
         self._locations: etree.Element
         self._modules: etree.Element
         self._stretch_v2: bool
-        self.gw_entities: dict[str, GwEntityData] = {}
         self.smile: Munch = Munch()
 
     @property
@@ -90,7 +86,7 @@ class SmileLegacyHelper(SmileCommon):
 
         self._create_legacy_gateway()
         # For legacy P1 collect the connected SmartMeter info
-        if self.smile.type == "power":
+        if self._plan.power:
             appl = Munch()
             self._p1_smartmeter_info_finder(appl)
             # Legacy P1 has no more devices
@@ -136,7 +132,6 @@ class SmileLegacyHelper(SmileCommon):
                 continue  # pragma: no cover
 
             self._create_gw_entities(appl)
-            self._reorder_devices()
 
     def _get_locations(self) -> None:
         """Collect all locations."""
@@ -154,7 +149,7 @@ class SmileLegacyHelper(SmileCommon):
             loc._type = location.find("type").text
             # Filter the valid single location for P1 legacy: services not empty
             locator = "./services"
-            if self.smile.type == "power" and len(location.find(locator)) == 0:
+            if self._plan.power and len(location.find(locator)) == 0:
                 continue
 
             if loc._type == "building":
@@ -168,10 +163,10 @@ class SmileLegacyHelper(SmileCommon):
         Use the home_location or FAKE_APPL as entity id.
         """
         self._gateway_id = self._home_loc_id
-        if self.smile.type == "power":
+        if self._plan.power:
             self._gateway_id = FAKE_APPL
 
-        self.gw_entities[self._gateway_id] = {"dev_class": "gateway"}
+        gateway: GwEntityData = {"dev_class": "gateway"}
         self._count += 1
         for key, value in {
             "firmware": str(self.smile.version),
@@ -184,9 +179,11 @@ class SmileLegacyHelper(SmileCommon):
         }.items():
             if value is not None:
                 gw_key = cast(ApplianceType, key)
-                self.gw_entities[self._gateway_id][gw_key] = value
+                gateway[gw_key] = value
                 self._count += 1
 
+        self.gw_entities[self._gateway_id] = gateway
+
     def _appliance_info_finder(self, appliance: etree, appl: Munch) -> Munch:
         """Collect entity info (Smile/Stretch, Thermostats, OpenTherm/On-Off): firmware, model and vendor name."""
         match appl.pwclass:
@@ -255,16 +252,16 @@ class SmileLegacyHelper(SmileCommon):
         data: GwEntityData = {"binary_sensors": {}, "sensors": {}, "switches": {}}
         # Get P1 smartmeter data from MODULES
         # !! DON'T CHANGE below two if-lines, will break stuff !!
-        if self.smile.type == "power":
+        if self._plan.power:
             if entity.get("dev_class") == "smartmeter":
                 data.update(self._power_data_from_modules())
 
             entity.update(data)
             return
 
-        measurements = DEVICE_MEASUREMENTS
-        if self._is_thermostat and entity_id == self.heater_id:
-            measurements = HEATER_CENTRAL_MEASUREMENTS
+        measurements = DEVICE_DISPATCH
+        if entity_id == self._heater_id:
+            measurements = self._plan.heater_measurements
 
         if (
             appliance := self._appliances.find(f'./appliance[@id="{entity_id}"]')
@@ -277,7 +274,7 @@ class SmileLegacyHelper(SmileCommon):
 
         # Anna: the Smile outdoor_temperature is present in the Home location
         # For some Anna's LOCATIONS is empty, falling back to domain_objects!
-        if self._is_thermostat and entity_id == self._gateway_id:
+        if self._plan.thermostat and entity_id == self._gateway_id:
             locator = f"./location[@id='{self._home_loc_id}']/logs/point_log[type='outdoor_temperature']/period/measurement"
             if (found := self._domain_objects.find(locator)) is not None:
                 value = format_measure(found.text, NONE)
@@ -296,17 +293,31 @@ class SmileLegacyHelper(SmileCommon):
         Collect the power-data from MODULES (P1 legacy only).
         """
         data: GwEntityData = {"sensors": {}}
-        loc = Munch()
         mod_list: list[str] = ["interval_meter", "cumulative_meter", "point_meter"]
-        t_string = "tariff_indicator"
 
-        search = self._modules
-        mod_logs = search.findall("./module/services")
-        for loc.measurement, loc.attrs in P1_LEGACY_MEASUREMENTS.items():
-            loc.meas_list = loc.measurement.partition("_")[0::2]
-            for loc.logs in mod_logs:
-                for loc.log_type in mod_list:
-                    collect_power_values(data, loc, t_string, legacy=True)
+        index = index_power_services(self._modules)
+        for measurement in P1_LEGACY_MEASUREMENTS:
+            kind, _, directionality = measurement.partition("_")
+            for log_type in mod_list:
+                # P1 legacy electricity_point_meter or gas_*_meter data come without tariff
+                no_tariff = "point" in log_type or "gas" in measurement
+                meter = f"{kind}_{log_type}"
+                for peak_select in ("nl_peak", "nl_offpeak"):
+                    if (val := index.get((meter, directionality, peak_select))) is None:
+                        # Avoid double processing by skipping one peak-list option
+                        if not no_tariff or peak_select == "nl_offpeak":
+                            continue
+                        if (val := index.get((meter, directionality, None))) is None:
+                            continue
+
+                    store_power_value(
+                        data,
+                        measurement,
+                        log_type,
+                        peak_select,
+                        val,
+                        measurements=P1_LEGACY_MEASUREMENTS,
+                    )
 
         self._count += len(data["sensors"])
         return data
@@ -315,10 +326,10 @@ class SmileLegacyHelper(SmileCommon):
         self,
         appliance: etree.Element,
         data: GwEntityData,
-        measurements: dict[str, DATA | UOM],
+        measurements: dict[str, MeasurementDispatch],
     ) -> None:
         """Helper-function for _get_measurement_data() - collect appliance measurement data."""
-        for measurement, attrs in measurements.items():
+        for measurement, dispatch in measurements.items():
             p_locator = f'.//logs/point_log[type="{measurement}"]/period/measurement'
             if (appl_p_loc := appliance.find(p_locator)) is not None:
                 if measurement == "domestic_hot_water_state":
@@ -327,10 +338,8 @@ class SmileLegacyHelper(SmileCommon):
                 if skip_obsolete_measurements(appliance, measurement):
                     continue  # pragma: no cover
 
-                if new_name := getattr(attrs, ATTR_NAME, None):
-                    measurement = new_name
-
-                common_match_cases(measurement, attrs, appl_p_loc, data)
+                measurement = dispatch.key
+                store_measurement(dispatch, appl_p_loc.text, data)
 
             i_locator = f'.//logs/interval_log[type="{measurement}"]/period/measurement'
             if (appl_i_loc := appliance.find(i_locator)) is not None:
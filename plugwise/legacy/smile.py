@@ -5,27 +5,35 @@ Plugwise backend module for Home Assistant Core - covering the legacy P1, Anna,
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
-import datetime as dt
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+import sys
 from typing import Any
 
+from plugwise.common import CommandJournal, EntityRegistry
 from plugwise.constants import (
     APPLIANCES,
     DOMAIN_OBJECTS,
     LOCATIONS,
     LOGGER,
     MODULES,
+    NONE,
     OFF,
     REQUIRE_APPLIANCES,
     RULES,
     STATE_OFF,
     STATE_ON,
+    ExtractionPlan,
+    GatewayTopology,
     GwEntityData,
+    PendingWrite,
     ThermoLoc,
 )
 from plugwise.exceptions import ConnectionFailedError, DataMissingError, PlugwiseError
 from plugwise.legacy.data import SmileLegacyData
+from plugwise.util import entity_base_data, topology_fingerprint, write_side_document
 
+from defusedxml import ElementTree as etree
 from munch import Munch
 
 
@@ -36,10 +44,13 @@ class SmileLegacyAPI(SmileLegacyData):
 
     def __init__(
         self,
-        _is_thermostat: bool,
+        _journal: CommandJournal | None,
         _loc_data: dict[str, ThermoLoc],
+        _low_memory: bool,
         _on_off_device: bool,
         _opentherm_device: bool,
+        _optimistic: bool,
+        _plan: ExtractionPlan,
         _request: Callable[..., Awaitable[Any]],
         _stretch_v2: bool,
         _target_smile: str,
@@ -48,31 +59,108 @@ class SmileLegacyAPI(SmileLegacyData):
         """Set the constructor for this class."""
         super().__init__()
         self._cooling_present = False
-        self._is_thermostat = _is_thermostat
+        self._journal = _journal
         self._loc_data = _loc_data
+        self._low_memory = _low_memory
         self._on_off_device = _on_off_device
         self._opentherm_device = _opentherm_device
+        self._optimistic = _optimistic
+        self._plan = _plan
         self._request = _request
         self._stretch_v2 = _stretch_v2
         self._target_smile = _target_smile
         self.smile = smile
 
         self._first_update = True
-        self._previous_day_number: str = "0"
+        self._topology: str = NONE
+        # The documents to request for an incremental update
+        self._update_endpoints = [DOMAIN_OBJECTS]
+        match self._target_smile:
+            case "smile_v2":
+                self._update_endpoints.append(MODULES)
+            case self._target_smile if self._target_smile in REQUIRE_APPLIANCES:
+                self._update_endpoints.append(APPLIANCES)
 
     @property
     def cooling_present(self) -> bool:
         """Return the cooling capability."""
         return False
 
-    async def full_xml_update(self) -> None:
-        """Perform a first fetch of the Plugwise server XML data."""
-        self._domain_objects = await self._request(DOMAIN_OBJECTS)
-        self._locations = await self._request(LOCATIONS)
-        self._modules = await self._request(MODULES)
+    async def full_xml_update(
+        self, prefetched: dict[str, etree.Element] | None = None
+    ) -> None:
+        """Perform a first fetch of the Plugwise server XML data.
+
+        Reuse the document(s) already fetched during connect(), when provided,
+        request the other documents concurrently.
+        """
+        endpoints = [DOMAIN_OBJECTS, LOCATIONS, MODULES]
         # P1 legacy has no appliances
-        if self.smile.type != "power":
-            self._appliances = await self._request(APPLIANCES)
+        if not self._plan.power:
+            endpoints.append(APPLIANCES)
+
+        documents = await self._request_documents(endpoints, prefetched)
+        self._domain_objects = documents[DOMAIN_OBJECTS]
+        self._locations = documents[LOCATIONS]
+        self._modules = documents[MODULES]
+        if APPLIANCES in documents:
+            self._appliances = documents[APPLIANCES]
+
+        self._topology = topology_fingerprint(
+            *(documents[endpoint] for endpoint in self._update_endpoints)
+        )
+
+    async def restore_topology(
+        self, topology: GatewayTopology, prefetched: dict[str, etree.Element]
+    ) -> bool:
+        """Restore the entities collected by an earlier full-update, from the gateway profile.
+
+        Request only the documents used by an incremental update, adding them to the prefetched documents.
+        Return False when the topology has changed, a full_xml_update() is then required.
+        """
+        endpoints = [DOMAIN_OBJECTS, MODULES if self._plan.power else APPLIANCES]
+        prefetched.update(await self._request_documents(endpoints, prefetched))
+        fingerprint = topology_fingerprint(
+            *(prefetched[endpoint] for endpoint in self._update_endpoints)
+        )
+        if fingerprint != topology["fingerprint"]:
+            LOGGER.info("Plugwise legacy gateway topology changed since the profile")
+            return False
+
+        self._domain_objects = prefetched[DOMAIN_OBJECTS]
+        if self._plan.power:
+            self._modules = prefetched[MODULES]
+        else:
+            self._appliances = prefetched[APPLIANCES]
+
+        self._rebase_entities(topology["entities"])
+        self._gateway_id = topology["gateway_id"]
+        self._heater_id = topology["heater_id"]
+        self._home_loc_id = topology["home_loc_id"]
+        self._loc_data.update(topology["loc_data"])
+        self._topology = fingerprint
+        self._first_update = False
+        return True
+
+    def export_topology(self) -> GatewayTopology | None:
+        """Export the entities and ids collected by the latest full-update, for the gateway profile.
+
+        Return None before the first update.
+        """
+        if not self.gw_entities:
+            return None
+
+        return GatewayTopology(
+            entities={
+                entity_id: entity_base_data(entity)
+                for entity_id, entity in self.gw_entities.items()
+            },
+            fingerprint=self._topology,
+            gateway_id=self._gateway_id,
+            heater_id=self._heater_id,
+            home_loc_id=self._home_loc_id,
+            loc_data=dict(self._loc_data),
+        )
 
     def get_all_gateway_entities(self) -> None:
         """Collect the Plugwise gateway entities and their data and states from the received raw XML-data.
@@ -86,41 +174,151 @@ class SmileLegacyAPI(SmileLegacyData):
         self._all_entity_data()
 
     async def async_update(self) -> dict[str, GwEntityData]:
-        """Perform an full update update at day-change: re-collect all gateway entities and their data and states.
+        """Perform a full update when the gateway topology has changed: re-collect all gateway entities and their data and states.
 
         Otherwise perform an incremental update: only collect the entities updated data and states.
         """
-        day_number = dt.datetime.now().strftime("%w")
-        if self._first_update or day_number != self._previous_day_number:
-            LOGGER.info(
-                "Performing daily full-update, reload the Plugwise integration when a single entity becomes unavailable."
-            )
+        documents: dict[str, etree.Element] = {}
+        if not self._first_update:
+            documents = await self._request_documents(self._update_endpoints)
+
+        self._update_errors = []
+        self._written = set()
+        self._written_rules = set()
+        if self._first_update or self._topology_changed(documents):
             try:
-                await self.full_xml_update()
+                # Reuse the incremental document(s) for the full update
+                await self.full_xml_update(documents)
+                self._previous_entities = self.gw_entities
+                self.gw_entities = EntityRegistry()
                 self.get_all_gateway_entities()
                 # Detect failed data-retrieval
                 _ = self.gw_entities[self.gateway_id]["location"]
             except KeyError as err:  # pragma: no cover
                 raise DataMissingError(f"No (full) legacy data: {err}") from err
+            finally:
+                # Only used as last-good data during the full update
+                self._previous_entities = {}
         else:
             try:
-                self._domain_objects = await self._request(DOMAIN_OBJECTS)
-                match self._target_smile:
-                    case "smile_v2":
-                        self._modules = await self._request(MODULES)
-                    case self._target_smile if self._target_smile in REQUIRE_APPLIANCES:
-                        self._appliances = await self._request(APPLIANCES)
-
-                self._update_gw_entities()
+                self._domain_objects = documents[DOMAIN_OBJECTS]
+                if MODULES in documents:
+                    self._modules = documents[MODULES]
+                if APPLIANCES in documents:
+                    self._appliances = documents[APPLIANCES]
+
+                self._previous_entities = self.gw_entities
+                self._rebase_entities(self._previous_entities)
+                self._update_gw_entities(self._previous_entities)
                 # Detect failed data-retrieval
                 _ = self.gw_entities[self.gateway_id]["location"]
             except KeyError as err:  # pragma: no cover
                 raise DataMissingError(f"No legacy data: {err}") from err
+            finally:
+                # Only used as last-good data during the incremental update
+                self._previous_entities = {}
 
+        self._confirm_pending_writes()
         self._first_update = False
-        self._previous_day_number = day_number
+        if self._low_memory:
+            self._release_documents()
+
+        return self.gw_entities
+
+    async def async_update_entity(self, entity_id: str) -> dict[str, GwEntityData]:
+        """Refresh a single appliance-entity: request only its appliance-data and re-collect its data and states.
+
+        The other entities keep the data of the latest update.
+        """
+        if not self._appliance_entity(entity_id):
+            raise PlugwiseError(f"Plugwise: {entity_id} is not an appliance-entity.")
+
+        await self._request_element(
+            self._appliances, APPLIANCES, "appliance", entity_id
+        )
+        self._refresh_appliances({entity_id}, self._refresh_entity_data)
         return self.gw_entities
 
+    async def async_update_zone(self, loc_id: str) -> dict[str, GwEntityData]:
+        """Legacy devices have no zones."""
+        raise PlugwiseError(f"Plugwise: {loc_id} is not a zone.")
+
+    async def async_refresh_written(self) -> bool:
+        """Refresh the appliance-entities written by the set-functions since the latest update or refresh.
+
+        Request only the written appliances, the written rules (presets, schedules) are left to the next update.
+        Return False when there is nothing to refresh.
+        """
+        written, self._written = self._written, set()
+        self._written_rules = set()
+        appliances = {
+            entity_id for entity_id in written if self._appliance_entity(entity_id)
+        }
+        if not appliances:
+            return False
+
+        await asyncio.gather(
+            *(
+                self._request_element(
+                    self._appliances, APPLIANCES, "appliance", element_id
+                )
+                for element_id in appliances
+            )
+        )
+        self._refresh_appliances(appliances, self._refresh_entity_data)
+        return True
+
+    def _appliance_entity(self, entity_id: str) -> bool:
+        """Helper-function for async_update_entity() and async_refresh_written().
+
+        Return True for an entity with its data collected from its appliance-data, P1 legacy has no appliances.
+        """
+        return (
+            not self._plan.power
+            and entity_id in self.gw_entities
+            and self._appliances.find(f'./appliance[@id="{entity_id}"]') is not None
+        )
+
+    def _rebase_entities(self, entities: Mapping[str, GwEntityData]) -> None:
+        """Helper-function for restore_topology() and async_update().
+
+        Start a new registry holding the appliance- and group-info of the entities, and its item-count.
+        The data of the entities is left untouched, for use as last-good data.
+        """
+        self.gw_entities = EntityRegistry()
+        self._count = 0
+        for entity_id, entity in entities.items():
+            self.gw_entities[sys.intern(entity_id)] = entity_base_data(entity)
+            self._count += len(self.gw_entities[entity_id])
+
+    def _release_documents(self) -> None:
+        """Helper-function for async_update().
+
+        Replace the documents requested by every update by a compact document holding the
+        items used by the set-functions. Release the documents only used by a full update,
+        P1 legacy requires the modules for the incremental updates.
+        """
+        self._domain_objects = write_side_document(self._domain_objects)
+        if APPLIANCES in self._update_endpoints:
+            self._appliances = write_side_document(self._appliances)
+
+        self._locations = self._locations.makeelement(self._locations.tag, {})
+        if not self._plan.power:
+            self._modules = self._modules.makeelement(self._modules.tag, {})
+
+    def _topology_changed(self, documents: dict[str, etree.Element]) -> bool:
+        """Helper-function for async_update().
+
+        Detect added, removed or relinked appliances, groups, locations and modules.
+        """
+        if topology_fingerprint(*documents.values()) == self._topology:
+            return False
+
+        LOGGER.info(
+            "Plugwise legacy gateway topology changed, performing a full-update"
+        )
+        return True
+
     ########################################################################################################
     ###  API Set and HA Service-related Functions                                                        ###
     ########################################################################################################
@@ -137,10 +335,12 @@ class SmileLegacyAPI(SmileLegacyData):
         location: str,
         mode: str,
         length: int,
+        *,
+        force: bool = False,
     ) -> None:
         """Set-function placeholder for legacy devices."""
 
-    async def set_gateway_mode(self, mode: str) -> None:
+    async def set_gateway_mode(self, mode: str, *, force: bool = False) -> None:
         """Set-function placeholder for legacy devices."""
 
     async def set_number(
@@ -148,18 +348,26 @@ class SmileLegacyAPI(SmileLegacyData):
         dev_id: str,
         key: str,
         temperature: float,
+        *,
+        force: bool = False,
     ) -> None:
         """Set-function placeholder for legacy devices."""
 
-    async def set_offset(self, dev_id: str, offset: float) -> None:
+    async def set_offset(
+        self, dev_id: str, offset: float, *, force: bool = False
+    ) -> None:
         """Set-function placeholder for legacy devices."""
 
-    async def set_preset(self, _: str, preset: str) -> None:
+    async def set_preset(self, _: str, preset: str, *, force: bool = False) -> None:
         """Set the given Preset on the relevant Thermostat - from DOMAIN_OBJECTS."""
         if not (presets := self._presets()):
             raise PlugwiseError("Plugwise: no presets available.")  # pragma: no cover
         if preset not in list(presets):
             raise PlugwiseError("Plugwise: invalid preset.")
+        if not force and self._unchanged(
+            self.gw_entities.by_class("thermostat"), None, {"active_preset": preset}
+        ):
+            return
 
         locator = f'rule/directives/when/then[@icon="{preset}"].../.../...'
         if (rule := self._domain_objects.find(locator)) is None:
@@ -168,9 +376,18 @@ class SmileLegacyAPI(SmileLegacyData):
             raise PlugwiseError("Plugwise: no preset id found.")  # pragma: no cover
 
         data = f"<rules><rule id='{rule_id}'><active>true</active></rule></rules>"
-        await self.call_request(RULES, method="put", data=data)
-
-    async def set_regulation_mode(self, mode: str) -> None:
+        writes = self._written_items(
+            self.gw_entities.by_class("thermostat"), None, {"active_preset": preset}
+        )
+        await self.call_request(RULES, method="put", data=data, writes=writes)
+        # Activate the preset rule, deactivate the other preset rules
+        for item in self._domain_objects.findall("./rule"):
+            if item.find("./directives/when/then[@icon]") is not None:
+                self._apply_written_xml(
+                    item, "./active", str(item.get("id") == rule_id).lower()
+                )
+
+    async def set_regulation_mode(self, mode: str, *, force: bool = False) -> None:
         """Set-function placeholder for legacy devices."""
 
     async def set_select(
@@ -179,16 +396,20 @@ class SmileLegacyAPI(SmileLegacyData):
         loc_id: str,
         option: str,
         state: str | None = None,
+        *,
+        force: bool = False,
     ) -> None:
         """Set the thermostat schedule option."""
         # schedule name corresponds to select option
-        await self.set_schedule_state("loc_id", option, state=state)
+        await self.set_schedule_state("loc_id", option, state=state, force=force)
 
     async def set_schedule_state(
         self,
         _: str,
         name: str | None = None,
         state: str | None = None,
+        *,
+        force: bool = False,
     ) -> None:
         """Activate/deactivate the Schedule.
 
@@ -212,6 +433,11 @@ class SmileLegacyAPI(SmileLegacyData):
             raise PlugwiseError(
                 "Plugwise: no schedule with this name available."
             )  # pragma: no cover
+        written = {"select_schedule": name if state == STATE_ON else OFF}
+        if not force and self._unchanged(
+            self.gw_entities.by_class("thermostat"), None, written
+        ):
+            return
 
         new_state = "false"
         if state == STATE_ON:
@@ -230,10 +456,19 @@ class SmileLegacyAPI(SmileLegacyData):
             "</rules>"
         )
         uri = f"{RULES};id={schedule_rule_id}"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            self.gw_entities.by_class("thermostat"), None, written
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
 
     async def set_switch_state(
-        self, appl_id: str, members: list[str] | None, model: str, state: str
+        self,
+        appl_id: str,
+        members: list[str] | None,
+        model: str,
+        state: str,
+        *,
+        force: bool = False,
     ) -> bool | None:
         """Set the given state of the relevant switch.
 
@@ -253,6 +488,11 @@ class SmileLegacyAPI(SmileLegacyData):
 
         # Handle switch-lock
         if model == "lock":
+            if not force and self._unchanged(
+                [appl_id], "switches", {"lock": requested_state}
+            ):
+                return requested_state
+
             state = "true" if state == STATE_ON else "false"
             appliance = self._appliances.find(f'appliance[@id="{appl_id}"]')
             appl_name = appliance.find("name").text
@@ -271,14 +511,22 @@ class SmileLegacyAPI(SmileLegacyData):
                 "</appliance>"
                 "</appliances>"
             )
-            await self.call_request(APPLIANCES, method="post", data=data)
+            writes = self._written_items(
+                [appl_id], "switches", {"lock": requested_state}
+            )
+            await self.call_request(APPLIANCES, method="post", data=data, writes=writes)
+            self._apply_written_xml(
+                self._appliances,
+                f'./appliance[@id="{appl_id}"]/{switch.actuator}/{switch.func_type}/lock',
+                state,
+            )
             return requested_state
 
         # Handle group of switches
         data = f"<{switch.func_type}><state>{state}</state></{switch.func_type}>"
         if members is not None:
             return await self._set_groupswitch_member_state(
-                appl_id, data, members, state, switch
+                appl_id, data, members, state, switch, force=force
             )
 
         # Handle individual relay switches
@@ -286,33 +534,73 @@ class SmileLegacyAPI(SmileLegacyData):
         if model == "relay" and self.gw_entities[appl_id]["switches"]["lock"]:
             # Don't bother switching a relay when the corresponding lock-state is true
             return current_state
+        if not force and self._unchanged(
+            [appl_id], "switches", {"relay": requested_state}
+        ):
+            return requested_state
 
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items([appl_id], "switches", {"relay": requested_state})
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._appliances,
+            f'./appliance[@id="{appl_id}"]/{switch.actuator}/{switch.func_type}/state',
+            state,
+        )
         return requested_state
 
     async def _set_groupswitch_member_state(
-        self, appl_id: str, data: str, members: list[str], state: str, switch: Munch
+        self,
+        appl_id: str,
+        data: str,
+        members: list[str],
+        state: str,
+        switch: Munch,
+        *,
+        force: bool,
     ) -> bool:
         """Helper-function for set_switch_state().
 
-        Set the requested state of the relevant switch within a group of switches.
+        Set the requested state of the relevant switch within a group of switches, concurrently.
+        The members already in the requested state are skipped, unless forced.
         Return the current group-state when none of the switches has changed its state, the requested state otherwise.
         """
         current_state = self.gw_entities[appl_id]["switches"]["relay"]
         requested_state = state == STATE_ON
-        switched = 0
+        writes: dict[str, Awaitable[None]] = {}
         for member in members:
-            if not self.gw_entities[member]["switches"]["lock"]:
+            if not self.gw_entities[member]["switches"]["lock"] and (
+                force
+                or not self._unchanged([member], "switches", {"relay": requested_state})
+            ):
                 uri = f"{APPLIANCES};id={member}/relay"
-                await self.call_request(uri, method="put", data=data)
-                switched += 1
+                writes[member] = self.call_request(
+                    uri,
+                    method="put",
+                    data=data,
+                    writes=self._written_items(
+                        [member], "switches", {"relay": requested_state}
+                    ),
+                )
+
+        switched = await self._send_member_writes(members, writes)
+        for member in switched:
+            self._apply_written_xml(
+                self._appliances,
+                f'./appliance[@id="{member}"]/{switch.actuator}/{switch.func_type}/state',
+                state,
+            )
 
-        if switched > 0:
+        if switched:
+            self._apply_written(
+                self._written_items([appl_id], "switches", {"relay": requested_state})
+            )
             return requested_state
 
         return current_state  # pragma: no cover
 
-    async def set_temperature(self, _: str, items: dict[str, float]) -> None:
+    async def set_temperature(
+        self, _: str, items: dict[str, float], *, force: bool = False
+    ) -> None:
         """Set the given Temperature on the relevant Thermostat."""
         setpoint: float | None = None
         if "setpoint" in items:
@@ -322,6 +610,12 @@ class SmileLegacyAPI(SmileLegacyData):
             raise PlugwiseError(
                 "Plugwise: failed setting temperature: no valid input provided"
             )  # pragma: no cover
+        if not force and self._unchanged(
+            self.gw_entities.by_class("thermostat"),
+            "thermostat",
+            {"setpoint": setpoint},
+        ):
+            return
 
         temperature = str(setpoint)
         data = (
@@ -330,13 +624,33 @@ class SmileLegacyAPI(SmileLegacyData):
             "</thermostat_functionality>"
         )
         uri = self._thermostat_uri()
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            self.gw_entities.by_class("thermostat"),
+            "thermostat",
+            {"setpoint": setpoint},
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._appliances,
+            "./appliance[type='thermostat']/actuator_functionalities/thermostat_functionality/setpoint",
+            temperature,
+        )
 
     async def call_request(self, uri: str, **kwargs: Any) -> None:
-        """ConnectionFailedError wrapper for calling request()."""
+        """ConnectionFailedError wrapper for calling request().
+
+        Apply the items written by the request, see _apply_written(), or journal them with the failed request.
+        """
         method: str = kwargs["method"]
         data: str | None = kwargs.get("data")
+        writes: list[PendingWrite] = kwargs.get("writes", [])
         try:
             await self._request(uri, method=method, data=data)
         except ConnectionFailedError as exc:
+            self._journal_command(uri, method, data, writes)
             raise ConnectionFailedError from exc
+
+        if self._journal is not None:
+            self._journal.discard(uri)
+        self._track_write(uri, writes)
+        self._apply_written(writes)
@@ -5,13 +5,14 @@ Plugwise backend module for Home Assistant Core.
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Awaitable, Callable
 import datetime as dt
 from typing import Any, cast
 
+from plugwise.common import CommandJournal, EntityRegistry
 from plugwise.constants import (
     ALLOWED_ZONE_PROFILES,
-    ANNA,
     APPLIANCES,
     DOMAIN_OBJECTS,
     GATEWAY_REBOOT,
@@ -24,12 +25,16 @@ from plugwise.constants import (
     RULES,
     STATE_OFF,
     STATE_ON,
+    ExtractionPlan,
+    GatewayTopology,
     GwEntityData,
+    PendingWrite,
     SwitchType,
     ThermoLoc,
 )
 from plugwise.data import SmileData
 from plugwise.exceptions import ConnectionFailedError, DataMissingError, PlugwiseError
+from plugwise.util import write_side_document
 
 from defusedxml import ElementTree as etree
 
@@ -66,10 +71,13 @@ class SmileAPI(SmileData):
         self,
         _cooling_present: bool,
         _elga: bool,
-        _is_thermostat: bool,
+        _journal: CommandJournal | None,
         _loc_data: dict[str, ThermoLoc],
+        _low_memory: bool,
         _on_off_device: bool,
         _opentherm_device: bool,
+        _optimistic: bool,
+        _plan: ExtractionPlan,
         _request: Callable[..., Awaitable[Any]],
         _schedule_old_states: dict[str, dict[str, str]],
         smile: Munch,
@@ -78,10 +86,13 @@ class SmileAPI(SmileData):
         super().__init__()
         self._cooling_present = _cooling_present
         self._elga = _elga
-        self._is_thermostat = _is_thermostat
+        self._journal = _journal
         self._loc_data = _loc_data
+        self._low_memory = _low_memory
         self._on_off_device = _on_off_device
         self._opentherm_device = _opentherm_device
+        self._optimistic = _optimistic
+        self._plan = _plan
         self._request = _request
         self._schedule_old_states = _schedule_old_states
         self.smile = smile
@@ -92,11 +103,26 @@ class SmileAPI(SmileData):
         """Return the cooling capability."""
         return self._cooling_present
 
-    async def full_xml_update(self) -> None:
-        """Perform a first fetch of the Plugwise server XML data."""
-        self._domain_objects = await self._request(DOMAIN_OBJECTS)
+    async def full_xml_update(
+        self, prefetched: dict[str, etree.Element] | None = None
+    ) -> None:
+        """Perform a first fetch of the Plugwise server XML data.
+
+        Reuse the document(s) already fetched during connect(), when provided.
+        """
+        self._domain_objects = await self._request_or_reuse(DOMAIN_OBJECTS, prefetched)
         self._get_plugwise_notifications()
 
+    async def restore_topology(
+        self, topology: GatewayTopology, prefetched: dict[str, etree.Element]
+    ) -> bool:
+        """Topology-placeholder, the entities are re-collected by every update."""
+        return False
+
+    def export_topology(self) -> None:
+        """Topology-placeholder, the entities are re-collected by every update."""
+        return None
+
     def get_all_gateway_entities(self) -> None:
         """Collect the Plugwise gateway entities and their data and states from the received raw XML-data.
 
@@ -106,7 +132,7 @@ class SmileAPI(SmileData):
         Finally, collect the data and states for each entity.
         """
         self._get_appliances()
-        if self._is_thermostat:
+        if self._plan.thermostat:
             self.therms_with_offset_func = (
                 self._get_appliances_with_offset_functionality()
             )
@@ -132,10 +158,15 @@ class SmileAPI(SmileData):
         Any change in the connected entities will be detected immediately.
         """
         self._zones = {}
-        self.gw_entities = {}
+        self._previous_entities = self.gw_entities
+        self._update_errors = []
+        self._written = set()
+        self._written_rules = set()
+        self.gw_entities = EntityRegistry()
         try:
             await self.full_xml_update()
             self.get_all_gateway_entities()
+            self._confirm_pending_writes()
             # Set self._cooling_enabled - required for set_temperature(),
             # also, check for a failed data-retrieval
             if self.heater_id != NONE:
@@ -149,9 +180,123 @@ class SmileAPI(SmileData):
                     ]
         except KeyError as err:
             raise DataMissingError(f"No data: {err}") from err
+        finally:
+            # Only used as last-good data during the update
+            self._previous_entities = {}
+
+        if self._low_memory:
+            self._domain_objects = write_side_document(self._domain_objects)
+
+        return self.gw_entities
+
+    async def async_update_entity(self, entity_id: str) -> dict[str, GwEntityData]:
+        """Refresh a single appliance-entity: request only its appliance-data and re-collect its data and states.
 
+        The other entities, and the gateway-wide states like the heating_state, keep the data of the latest update.
+        """
+        if not self._appliance_entity(entity_id):
+            raise PlugwiseError(f"Plugwise: {entity_id} is not an appliance-entity.")
+
+        await self._request_element(
+            self._domain_objects, APPLIANCES, "appliance", entity_id
+        )
+        self._refresh_appliances({entity_id}, self._update_entity)
+        return self.gw_entities
+
+    async def async_update_zone(self, loc_id: str) -> dict[str, GwEntityData]:
+        """Refresh a single zone: request only its location-data and re-collect its data and states.
+
+        The other entities, also the thermostats in the zone, keep the data of the latest update.
+        """
+        if loc_id not in self._zones:
+            raise PlugwiseError(f"Plugwise: {loc_id} is not a zone.")
+
+        await self._request_element(self._domain_objects, LOCATIONS, "location", loc_id)
+        self._refresh_zones({loc_id})
         return self.gw_entities
 
+    async def async_refresh_written(self) -> bool:
+        """Refresh the entities written by the set-functions since the latest update or refresh.
+
+        Request only the written appliances and zones, the location of a written thermostat without zone,
+        and the written rules with the thermostat-appliances of the locations they are active in.
+        Return False when there is nothing to refresh.
+        """
+        written, self._written = self._written, set()
+        rules, self._written_rules = self._written_rules, set()
+        appliances: set[str] = set()
+        locations: set[str] = set()
+        for entity_id in written:
+            if entity_id in self._zones:
+                locations.add(entity_id)
+            elif self._appliance_entity(entity_id):
+                appliances.add(entity_id)
+                entity = self.gw_entities[entity_id]
+                if entity["dev_class"] == self._plan.climate_class:
+                    locations.add(entity["location"])
+        for rule_id in rules:
+            locator = f'./rule[@id="{rule_id}"]/contexts/context/zone/location'
+            for location in self._domain_objects.findall(locator):
+                locations.add(location.get("id"))
+
+        zones = locations & self._zones.keys()
+        for loc_id in locations - zones:
+            appliances.update(self._climate_entities(loc_id))
+
+        requests = [
+            *((APPLIANCES, "appliance", item) for item in appliances),
+            *((LOCATIONS, "location", item) for item in locations),
+            *((RULES, "rule", item) for item in rules),
+        ]
+        if not requests:
+            return False
+
+        await asyncio.gather(
+            *(
+                self._request_element(self._domain_objects, endpoint, tag, element_id)
+                for endpoint, tag, element_id in requests
+            )
+        )
+        self._refresh_appliances(appliances, self._update_entity)
+        self._refresh_zones(zones)
+        return True
+
+    def _appliance_entity(self, entity_id: str) -> bool:
+        """Helper-function for async_update_entity() and async_refresh_written().
+
+        Return True for an entity with its data collected from its appliance-data.
+        """
+        return (
+            entity_id in self.gw_entities
+            and self.gw_entities[entity_id]["dev_class"] != "smartmeter"
+            and self._domain_objects.find(f'./appliance[@id="{entity_id}"]') is not None
+        )
+
+    def _climate_entities(self, loc_id: str) -> list[str]:
+        """Helper-function for async_refresh_written() and the set-functions.
+
+        Return the zone, or the thermostat-entities present in the location.
+        """
+        if loc_id in self._zones:
+            return [loc_id]
+
+        return [
+            entity_id
+            for entity_id in self.gw_entities.by_location(loc_id)
+            if self.gw_entities[entity_id]["dev_class"] == self._plan.climate_class
+        ]
+
+    def _refresh_zones(self, zones: set[str]) -> None:
+        """Helper-function for async_update_zone() and async_refresh_written().
+
+        Re-collect the data of the zones.
+        """
+        for loc_id in zones:
+            self._refresh_entity(self._zones, loc_id, self._get_location_data)
+            self.gw_entities[loc_id] = self._zones[loc_id]
+
+        self._confirm_pending_writes(zones)
+
     ########################################################################################################
     ###  API Set and HA Service-related Functions                                                        ###
     ########################################################################################################
@@ -169,15 +314,23 @@ class SmileAPI(SmileData):
         dev_id: str,
         key: str,
         temperature: float,
+        *,
+        force: bool = False,
     ) -> None:
         """Set the boiler- or DHW-setpoint on the Central Heating boiler or the temperature-offset on a Thermostat."""
+        platform = key
         match key:
             case "temperature_offset":
-                await self.set_offset(dev_id, temperature)
+                await self.set_offset(dev_id, temperature, force=force)
                 return
             case "max_dhw_temperature":
                 key = "domestic_hot_water_setpoint"
 
+        if not force and self._unchanged(
+            [self._heater_id], platform, {"setpoint": temperature}
+        ):
+            return
+
         temp = str(temperature)
         thermostat_id: str | None = None
         locator = f'appliance[@id="{self._heater_id}"]/actuator_functionalities/thermostat_functionality'
@@ -195,26 +348,54 @@ class SmileAPI(SmileData):
             "</thermostat_functionality>"
         )
         uri = f"{APPLIANCES};id={self._heater_id}/thermostat;id={thermostat_id}"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            [self._heater_id], platform, {"setpoint": temperature}
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._domain_objects,
+            f'{locator}[@id="{thermostat_id}"]/setpoint',
+            temp,
+        )
 
-    async def set_offset(self, dev_id: str, offset: float) -> None:
+    async def set_offset(
+        self, dev_id: str, offset: float, *, force: bool = False
+    ) -> None:
         """Set the Temperature offset for thermostats that support this feature."""
         if dev_id not in self.therms_with_offset_func:
             raise PlugwiseError(
                 "Plugwise: this device does not have temperature-offset capability."
             )
+        if not force and self._unchanged(
+            [dev_id], "temperature_offset", {"setpoint": offset}
+        ):
+            return
 
         value = str(offset)
         data = f"<offset_functionality><offset>{value}</offset></offset_functionality>"
         uri = f"{APPLIANCES};id={dev_id}/offset;type=temperature_offset"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            [dev_id], "temperature_offset", {"setpoint": offset}
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._domain_objects,
+            f'./appliance[@id="{dev_id}"]/actuator_functionalities/offset_functionality[type="temperature_offset"]/offset',
+            value,
+        )
 
-    async def set_preset(self, loc_id: str, preset: str) -> None:
+    async def set_preset(
+        self, loc_id: str, preset: str, *, force: bool = False
+    ) -> None:
         """Set the given Preset on the relevant Thermostat - from LOCATIONS."""
         if (presets := self._presets(loc_id)) is None:
             raise PlugwiseError("Plugwise: no presets available.")  # pragma: no cover
         if preset not in list(presets):
             raise PlugwiseError("Plugwise: invalid preset.")
+        if not force and self._unchanged(
+            self._climate_entities(loc_id), None, {"active_preset": preset}
+        ):
+            return
 
         current_location = self._domain_objects.find(f'location[@id="{loc_id}"]')
         location_name = current_location.find("name").text
@@ -229,7 +410,11 @@ class SmileAPI(SmileData):
             "</locations>"
         )
         uri = f"{LOCATIONS};id={loc_id}"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            self._climate_entities(loc_id), None, {"active_preset": preset}
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(current_location, "./preset", preset)
 
     async def set_select(
         self,
@@ -237,27 +422,33 @@ class SmileAPI(SmileData):
         appl_or_loc_id: str,
         option: str,
         state: str | None = None,
+        *,
+        force: bool = False,
     ) -> None:
         """Set a dhw/gateway/regulation mode or the thermostat schedule option."""
         match key:
             case "select_dhw_mode" | "dhw_mode":
                 state = STATE_ON if option == "comfort" else STATE_OFF
                 # Appliance id is passed
-                await self.set_switch_state(appl_or_loc_id, None, key, state)
+                await self.set_switch_state(
+                    appl_or_loc_id, None, key, state, force=force
+                )
             case "select_gateway_mode":
-                await self.set_gateway_mode(option)
+                await self.set_gateway_mode(option, force=force)
             case "select_regulation_mode":
-                await self.set_regulation_mode(option)
+                await self.set_regulation_mode(option, force=force)
             case "select_schedule":
                 # The schedule name corresponds to the select option
                 # Location id is passed
-                await self.set_schedule_state(appl_or_loc_id, option, state=state)
+                await self.set_schedule_state(
+                    appl_or_loc_id, option, state=state, force=force
+                )
             case "select_zone_profile":
                 # Location id is passed
-                await self.set_zone_profile(appl_or_loc_id, option)
+                await self.set_zone_profile(appl_or_loc_id, option, force=force)
 
     async def set_dhw_mode(
-        self, key: str, appl_id: str, mode: str, length: int
+        self, key: str, appl_id: str, mode: str, length: int, *, force: bool = False
     ) -> None:
         """Set the domestic hot water mode.
 
@@ -270,8 +461,15 @@ class SmileAPI(SmileData):
 
         match length:
             case 2:
-                await self.set_select(key, appl_id, mode)
+                await self.set_select(key, appl_id, mode, force=force)
             case _:
+                # A heater with a max_dhw_temperature carries the mode as dhw_mode
+                item = "select_dhw_mode"
+                if "dhw_mode" in self.gw_entities.get(self._heater_id, {}):
+                    item = "dhw_mode"
+                if not force and self._unchanged([self._heater_id], None, {item: mode}):
+                    return
+
                 data = (
                     "<domestic_hot_water_mode_control_functionality>"
                     f"<mode>{mode}</mode>"
@@ -280,12 +478,17 @@ class SmileAPI(SmileData):
                 uri = (
                     f"{APPLIANCES};type=heater_central/domestic_hot_water_mode_control"
                 )
-                await self.call_request(uri, method="put", data=data)
+                writes = self._written_items([self._heater_id], None, {item: mode})
+                await self.call_request(uri, method="put", data=data, writes=writes)
 
-    async def set_gateway_mode(self, mode: str) -> None:
+    async def set_gateway_mode(self, mode: str, *, force: bool = False) -> None:
         """Set the gateway mode."""
         if mode not in self._gw_allowed_modes:
             raise PlugwiseError("Plugwise: invalid gateway mode.")
+        if not force and self._unchanged(
+            [self.gateway_id], None, {"select_gateway_mode": mode}
+        ):
+            return
 
         end_time = "2037-04-21T08:00:53.000Z"
         valid = ""
@@ -312,12 +515,24 @@ class SmileAPI(SmileData):
             "</gateway_mode_control_functionality>"
         )
         uri = f"{APPLIANCES};id={self.gateway_id}/gateway_mode_control"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            [self.gateway_id], None, {"select_gateway_mode": mode}
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._domain_objects,
+            f'./appliance[@id="{self.gateway_id}"]/actuator_functionalities/gateway_mode_control_functionality/mode',
+            mode,
+        )
 
-    async def set_regulation_mode(self, mode: str) -> None:
+    async def set_regulation_mode(self, mode: str, *, force: bool = False) -> None:
         """Set the heating regulation mode."""
         if mode not in self._reg_allowed_modes:
             raise PlugwiseError("Plugwise: invalid regulation mode.")
+        if not force and self._unchanged(
+            [self.gateway_id], None, {"select_regulation_mode": mode}
+        ):
+            return
 
         duration = ""
         if "bleeding" in mode:
@@ -330,12 +545,26 @@ class SmileAPI(SmileData):
             "</regulation_mode_control_functionality>"
         )
         uri = f"{APPLIANCES};type=gateway/regulation_mode_control"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            [self.gateway_id], None, {"select_regulation_mode": mode}
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._domain_objects,
+            './appliance[type="gateway"]/actuator_functionalities/regulation_mode_control_functionality/mode',
+            mode,
+        )
 
-    async def set_zone_profile(self, loc_id: str, profile: str) -> None:
+    async def set_zone_profile(
+        self, loc_id: str, profile: str, *, force: bool = False
+    ) -> None:
         """Set the Adam thermoszone heating profile."""
         if profile not in ALLOWED_ZONE_PROFILES:
             raise PlugwiseError("Plugwise: invalid zone profile.")
+        if not force and self._unchanged(
+            [loc_id], None, {"select_zone_profile": profile}
+        ):
+            return
 
         data = (
             "<thermostat_functionality>"
@@ -343,10 +572,16 @@ class SmileAPI(SmileData):
             "</thermostat_functionality>"
         )
         uri = f"{LOCATIONS};id={loc_id}/thermostat"
-        await self.call_request(uri, method="post", data=data)
+        writes = self._written_items([loc_id], None, {"select_zone_profile": profile})
+        await self.call_request(uri, method="post", data=data, writes=writes)
 
     async def set_schedule_state(
-        self, loc_id: str, name: str | None = None, state: str | None = None
+        self,
+        loc_id: str,
+        name: str | None = None,
+        state: str | None = None,
+        *,
+        force: bool = False,
     ) -> None:
         """Activate/deactivate the Schedule, with the given name, on the relevant Thermostat.
 
@@ -375,14 +610,14 @@ class SmileAPI(SmileData):
             raise PlugwiseError("Plugwise: no schedule with this name available.")
 
         # If no state change is requested, do nothing
-        if state == self._schedule_old_states[loc_id][name]:
+        if not force and state == self._schedule_old_states[loc_id][name]:
             return
 
         schedule_rule_id: str = next(iter(schedule_rule))
         template = (
             '<template tag="zone_preset_based_on_time_and_presence_with_override" />'
         )
-        if self.check_name(ANNA):
+        if self._plan.anna:
             locator = f'.//*[@id="{schedule_rule_id}"]/template'
             template_id = self._domain_objects.find(locator).get("id")
             template = f'<template id="{template_id}" />'
@@ -398,7 +633,12 @@ class SmileAPI(SmileData):
             "</rules>"
         )
         uri = f"{RULES};id={schedule_rule_id}"
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            self._climate_entities(loc_id),
+            None,
+            {"select_schedule": name if state == STATE_ON else OFF},
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
         self._schedule_old_states[loc_id][name] = state
 
     def determine_contexts(self, loc_id: str, state: str, sched_id: str) -> str:
@@ -418,7 +658,13 @@ class SmileAPI(SmileData):
         return str(etree.tostring(contexts, encoding="unicode").rstrip())
 
     async def set_switch_state(
-        self, appl_id: str, members: list[str] | None, model: str, state: str
+        self,
+        appl_id: str,
+        members: list[str] | None,
+        model: str,
+        state: str,
+        *,
+        force: bool = False,
     ) -> bool | None:
         """Set the given state of the relevant Switch.
 
@@ -452,7 +698,7 @@ class SmileAPI(SmileData):
 
         if members is not None:
             return await self._set_groupswitch_member_state(
-                appl_id, data, members, state, switch
+                appl_id, data, members, state, switch, force=force
             )
 
         uri = f"{APPLIANCES};id={appl_id}/{switch.device}{extra}"
@@ -462,42 +708,91 @@ class SmileAPI(SmileData):
                 # Don't switch a relay when its corresponding lock-state is true or no
                 # lock is present. That means the relay can't be controlled by the user.
                 return current_state
+        if not force and self._unchanged(
+            [appl_id], "switches", {model: requested_state}
+        ):
+            return requested_state
 
-        await self.call_request(uri, method=switch.method, data=data)
+        writes = self._written_items([appl_id], "switches", {model: requested_state})
+        await self.call_request(uri, method=switch.method, data=data, writes=writes)
+        locator = f"{switch.func_type}/{switch.func}"
+        if switch.device == "toggle":
+            locator = f'toggle_functionality[type="{switch.act_type}"]/state'
+        self._apply_written_xml(
+            self._domain_objects,
+            f'./appliance[@id="{appl_id}"]/{switch.actuator}/{locator}',
+            state,
+        )
         return requested_state
 
     async def _set_groupswitch_member_state(
-        self, appl_id: str, data: str, members: list[str], state: str, switch: Munch
+        self,
+        appl_id: str,
+        data: str,
+        members: list[str],
+        state: str,
+        switch: Munch,
+        *,
+        force: bool,
     ) -> bool:
         """Helper-function for set_switch_state().
 
-        Set the requested state of the relevant switch within a group of switches.
+        Set the requested state of the relevant switch within a group of switches, concurrently.
+        The members already in the requested state are skipped, unless forced.
         Return the current group-state when none of the switches has changed its state, the requested state otherwise.
         """
         current_state = self.gw_entities[appl_id]["switches"]["relay"]
         requested_state = state == STATE_ON
-        switched = 0
+        writes: dict[str, Awaitable[None]] = {}
         for member in members:
             uri = f"{APPLIANCES};id={member}/{switch.device}"
             lock_blocked = self.gw_entities[member]["switches"].get("lock")
             # Assume Plugs under Plugwise control are not part of a group
-            if lock_blocked is not None and not lock_blocked:
-                await self.call_request(uri, method="put", data=data)
-                switched += 1
+            if (
+                lock_blocked is not None
+                and not lock_blocked
+                and (
+                    force
+                    or not self._unchanged(
+                        [member], "switches", {"relay": requested_state}
+                    )
+                )
+            ):
+                writes[member] = self.call_request(
+                    uri,
+                    method="put",
+                    data=data,
+                    writes=self._written_items(
+                        [member], "switches", {"relay": requested_state}
+                    ),
+                )
 
-        if switched > 0:
+        switched = await self._send_member_writes(members, writes)
+        for member in switched:
+            self._apply_written_xml(
+                self._domain_objects,
+                f'./appliance[@id="{member}"]/{switch.actuator}/{switch.func_type}/{switch.func}',
+                state,
+            )
+
+        if switched:
+            self._apply_written(
+                self._written_items([appl_id], "switches", {"relay": requested_state})
+            )
             return requested_state
 
         return current_state
 
-    async def set_temperature(self, loc_id: str, items: dict[str, float]) -> None:
+    async def set_temperature(
+        self, loc_id: str, items: dict[str, float], *, force: bool = False
+    ) -> None:
         """Set the given Temperature on the relevant Thermostat."""
         setpoint: float | None = None
 
         if "setpoint" in items:
             setpoint = items["setpoint"]
 
-        if self.check_name(ANNA) and self._cooling_present:
+        if self._plan.anna and self._cooling_present:
             if "setpoint_high" not in items:
                 raise PlugwiseError(
                     "Plugwise: failed setting temperature: no valid input provided"
@@ -521,6 +816,10 @@ class SmileAPI(SmileData):
             raise PlugwiseError(
                 "Plugwise: failed setting temperature: no valid input provided"
             )  # pragma: no cover"
+        if not force and self._unchanged(
+            self._climate_entities(loc_id), "thermostat", items
+        ):
+            return
 
         temperature = str(setpoint)
         data = (
@@ -529,13 +828,31 @@ class SmileAPI(SmileData):
             "</thermostat_functionality>"
         )
         uri = self._thermostat_uri(loc_id)
-        await self.call_request(uri, method="put", data=data)
+        writes = self._written_items(
+            self._climate_entities(loc_id), "thermostat", items
+        )
+        await self.call_request(uri, method="put", data=data, writes=writes)
+        self._apply_written_xml(
+            self._domain_objects,
+            f'./location[@id="{loc_id}"]/actuator_functionalities/thermostat_functionality/setpoint',
+            temperature,
+        )
 
     async def call_request(self, uri: str, **kwargs: Any) -> None:
-        """ConnectionFailedError wrapper for calling request()."""
+        """ConnectionFailedError wrapper for calling request().
+
+        Apply the items written by the request, see _apply_written(), or journal them with the failed request.
+        """
         method: str = kwargs["method"]
         data: str | None = kwargs.get("data")
+        writes: list[PendingWrite] = kwargs.get("writes", [])
         try:
             await self._request(uri, method=method, data=data)
         except ConnectionFailedError as exc:
+            self._journal_command(uri, method, data, writes)
             raise ConnectionFailedError from exc
+
+        if self._journal is not None:
+            self._journal.discard(uri)
+        self._track_write(uri, writes)
+        self._apply_written(writes)
@@ -5,7 +5,9 @@ Plugwise Smile communication protocol helpers.
 
 from __future__ import annotations
 
-from plugwise.constants import LOGGER
+import asyncio
+
+from plugwise.constants import LOGGER, MAX_CONCURRENT_REQUESTS
 from plugwise.exceptions import (
     ConnectionFailedError,
     InvalidAuthentication,
@@ -52,6 +54,8 @@ class SmileComm:
             "Authorization": encode_basic_auth(username, password=password)
         }
         self._endpoint = f"http://{host}:{str(port)}"  # Sensitive
+        self._request_failed = False
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
     async def _request(
         self,
@@ -60,7 +64,29 @@ class SmileComm:
         method: str = "get",
         data: str | None = None,
     ) -> etree.Element:
-        """Get/put/delete data from a give URL."""
+        """Get/put/delete data from a give URL.
+
+        Limit the number of concurrent requests to the Gateway.
+        Keep track of a connection-failure of the latest request.
+        """
+        async with self._request_slots:
+            try:
+                result = await self._send_request(command, retry, method, data)
+            except ConnectionFailedError:
+                self._request_failed = True
+                raise
+
+            self._request_failed = False
+            return result
+
+    async def _send_request(
+        self,
+        command: str,
+        retry: int,
+        method: str,
+        data: str | None,
+    ) -> etree.Element:
+        """Helper-function for _request()."""
         resp: ClientResponse
         url = f"{self._endpoint}{command}"
         try:
@@ -96,7 +122,7 @@ class SmileComm:
                     exc,
                 )
                 raise ConnectionFailedError from exc
-            return await self._request(command, retry - 1)
+            return await self._send_request(command, retry - 1, "get", None)
 
         if resp.status == 504:
             if retry < 1:
@@ -107,7 +133,7 @@ class SmileComm:
                     "504 Gateway Timeout",
                 )
                 raise ConnectionFailedError
-            return await self._request(command, retry - 1)
+            return await self._send_request(command, retry - 1, "get", None)
 
         return await self._request_validate(resp, method)
 
@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 import datetime as dt
+import hashlib
 import re
-from typing import cast
+from typing import Final, cast
 
 from plugwise.constants import (
+    ADAM,
+    ANNA,
+    ATTR_NAME,
     ATTR_UNIT_OF_MEASUREMENT,
     BINARY_SENSORS,
     DATA,
+    DEVICE_MEASUREMENTS,
     ELECTRIC_POTENTIAL_VOLT,
     ENERGY_KILO_WATT_HOUR,
+    ENTITY_BASE_ITEMS,
+    GROUP_MEASUREMENTS,
+    HEATER_CENTRAL_MEASUREMENTS,
     HW_MODELS,
     NONE,
     OBSOLETE_MEASUREMENTS,
@@ -22,57 +31,19 @@ from plugwise.constants import (
     SPECIALS,
     SWITCHES,
     UOM,
-    BinarySensorType,
+    ZONE_MEASUREMENTS,
+    ExtractionPlan,
     GwEntityData,
+    MeasurementDispatch,
     ModuleData,
+    PlatformType,
     SensorType,
-    SpecialType,
-    SwitchType,
 )
 
 from defusedxml import ElementTree as etree
 from munch import Munch
 
-
-def check_alternative_location(loc: Munch, legacy: bool) -> Munch:
-    """Helper-function for _power_data_peak_value()."""
-    if in_alternative_location(loc, legacy):
-        # Avoid double processing by skipping one peak-list option
-        if loc.peak_select == "nl_offpeak":
-            loc.found = False
-            return loc
-
-        loc.locator = f'./{loc.log_type}[type="{loc.measurement}"]/period/measurement'
-        if legacy:
-            loc.locator = (
-                f"./{loc.meas_list[0]}_{loc.log_type}/"
-                f'measurement[@directionality="{loc.meas_list[1]}"]'
-            )
-
-        if loc.logs.find(loc.locator) is None:
-            loc.found = False
-            return loc
-
-        return loc
-
-    loc.found = False
-    return loc
-
-
-def in_alternative_location(loc: Munch, legacy: bool) -> bool:
-    """Look for P1 gas_consumed or phase data (without tariff).
-
-    For legacy look for P1 legacy electricity_point_meter or gas_*_meter data.
-    """
-    present = "log" in loc.log_type and (
-        "gas" in loc.measurement or "phase" in loc.measurement
-    )
-    if legacy:
-        present = "meter" in loc.log_type and (
-            "point" in loc.log_type or "gas" in loc.measurement
-        )
-
-    return present
+MAC_PATTERN: Final = re.compile(r"(?:[0-9A-F]{2}){8}")
 
 
 def check_heater_central(xml: etree.Element) -> str:
@@ -122,57 +93,69 @@ def check_model(name: str | None, vendor_name: str | None) -> str | None:
     return None
 
 
-def collect_power_values(
-    data: GwEntityData, loc: Munch, tariff: str, legacy: bool = False
-) -> None:
-    """Something."""
-    for loc.peak_select in ("nl_peak", "nl_offpeak"):
-        loc.locator = (
-            f'./{loc.log_type}[type="{loc.measurement}"]/period/'
-            f'measurement[@{tariff}="{loc.peak_select}"]'
-        )
-        if legacy:
-            loc.locator = (
-                f"./{loc.meas_list[0]}_{loc.log_type}/measurement"
-                f'[@directionality="{loc.meas_list[1]}"][@{tariff}="{loc.peak_select}"]'
-            )
+def compile_extraction_plan(smile: Munch, is_thermostat: bool) -> ExtractionPlan:
+    """Compile the extraction plan for the detected gateway type.
 
-        loc = power_data_peak_value(loc, legacy)
-        if not loc.found:
-            continue
+    Helper-function for connect(), the result is used on every update.
+    """
+    adam = ADAM in smile.name
+    # Also matches Smile Anna P1
+    anna = ANNA in smile.name
+    power = smile.type == "power"
+    return ExtractionPlan(
+        adam=adam,
+        anna=anna,
+        power=power,
+        thermostat=is_thermostat,
+        smartmeter_location=power or smile.anna_p1,
+        power_only=power and not smile.anna_p1,
+        notifications=is_thermostat or power,
+        groups=not (power or anna),
+        zone_class="climate" if adam else "thermostat",
+        climate_class="thermostat" if anna else None,
+        heater_measurements=(
+            HEATER_CENTRAL_DISPATCH if is_thermostat else DEVICE_DISPATCH
+        ),
+    )
 
-        power_data_energy_diff(loc.measurement, loc.net_string, loc.f_val, data)
-        key = cast(SensorType, loc.key_string)
-        data["sensors"][key] = loc.f_val
 
+def compile_measurements(
+    measurements: Mapping[str, DATA | UOM],
+) -> dict[str, MeasurementDispatch]:
+    """Precompile a measurement table into a dispatch table.
 
-def common_match_cases(
-    measurement: str,
-    attrs: DATA | UOM,
-    location: etree.Element,
-    data: GwEntityData,
-) -> None:
-    """Helper-function for common match-case execution."""
-    value = location.text in ("on", "true")
-    match measurement:
-        case _ as measurement if measurement in BINARY_SENSORS:
-            bs_key = cast(BinarySensorType, measurement)
-            data["binary_sensors"][bs_key] = value
-        case _ as measurement if measurement in SENSORS:
-            s_key = cast(SensorType, measurement)
-            s_value = format_measure(
-                location.text, getattr(attrs, ATTR_UNIT_OF_MEASUREMENT)
-            )
-            data["sensors"][s_key] = s_value
-        case _ as measurement if measurement in SWITCHES:
-            sw_key = cast(SwitchType, measurement)
-            data["switches"][sw_key] = value
-        case _ as measurement if measurement in SPECIALS:
-            sp_key = cast(SpecialType, measurement)
-            data[sp_key] = value
-
-    if "battery" in data["sensors"]:
-        data["binary_sensors"]["low_battery"] = False
+    Each measurement type is mapped to its output key, its target platform dict
+    and a converter bound to its unit of measurement.
+    """
+    table: dict[str, MeasurementDispatch] = {}
+    for measurement, attrs in measurements.items():
+        key = getattr(attrs, ATTR_NAME, None) or measurement
+        convert: Callable[[str], bool | float | int] = format_state
+        platform: PlatformType | None = None
+        if key in BINARY_SENSORS:
+            platform = "binary_sensors"
+        elif key in SENSORS:
+            platform = "sensors"
+            unit = getattr(attrs, ATTR_UNIT_OF_MEASUREMENT)
+            convert = FORMATTERS.get(unit, _format_default)
+        elif key in SWITCHES:
+            platform = "switches"
+        elif key in SPECIALS:
+            platform = "entity"
+
+        table[measurement] = MeasurementDispatch(
+            key, platform, convert, key == "battery"
+        )
+
+    return table
+
+
+def entity_base_data(data: GwEntityData) -> GwEntityData:
+    """Return the appliance- or zone-info of the entity-data, see ENTITY_BASE_ITEMS."""
+    return cast(
+        GwEntityData,
+        {key: value for key, value in data.items() if key in ENTITY_BASE_ITEMS},
+    )
 
 
 def count_data_items(count: int, data: GwEntityData) -> int:
@@ -196,25 +179,59 @@ def escape_illegal_xml_characters(xmldata: str) -> str:
     return re.sub(r"&([^a-zA-Z#])", r"&amp;\1", xmldata)
 
 
-def format_measure(measure: str, unit: str) -> float | int:
-    """Format measure to correct type."""
+def _round_default(float_measure: float) -> float:
+    """Round to 2 decimals below 10, to 1 decimal otherwise."""
+    if abs(float_measure) < 10:
+        return round(float_measure, 2)
+
+    return round(float_measure, 1)
+
+
+def _format_default(measure: str) -> float:
+    """Format a measure without a specific unit-formatting."""
+    return _round_default(float(measure))
+
+
+def _format_energy_kwh(measure: str) -> float:
+    """Format a Wh measure to kWh."""
+    return round(float(measure) / 1000, 3)
+
+
+def _format_percentage(measure: str) -> float | int:
+    """Format a percentage, a fraction is converted to a whole percentage."""
     float_measure = float(measure)
-    if unit == PERCENTAGE and 0 < float_measure <= 1:
+    if 0 < float_measure <= 1:
         return int(float_measure * 100)
 
-    if unit == ENERGY_KILO_WATT_HOUR:
-        float_measure = float_measure / 1000
+    return _round_default(float_measure)
+
 
-    if unit in SPECIAL_FORMAT:
-        result = round(float_measure, 3)
-    elif unit == ELECTRIC_POTENTIAL_VOLT:
-        result = round(float_measure, 1)
-    elif abs(float_measure) < 10:
-        result = round(float_measure, 2)
-    else:  # abs(float_measure) >= 10
-        result = round(float_measure, 1)
+def _format_special(measure: str) -> float:
+    """Format a measure with a 3 decimals precision."""
+    return round(float(measure), 3)
 
-    return result
+
+def _format_voltage(measure: str) -> float:
+    """Format a voltage measure."""
+    return round(float(measure), 1)
+
+
+FORMATTERS: Final[dict[str, Callable[[str], float | int]]] = {
+    **dict.fromkeys(SPECIAL_FORMAT, _format_special),
+    ELECTRIC_POTENTIAL_VOLT: _format_voltage,
+    ENERGY_KILO_WATT_HOUR: _format_energy_kwh,
+    PERCENTAGE: _format_percentage,
+}
+
+
+def format_measure(measure: str, unit: str) -> float | int:
+    """Format measure to correct type."""
+    return FORMATTERS.get(unit, _format_default)(measure)
+
+
+def format_state(state: str) -> bool:
+    """Format a state measure to a bool."""
+    return state in ("on", "true")
 
 
 def get_vendor_name(module: etree.Element, model_data: ModuleData) -> ModuleData:
@@ -227,6 +244,63 @@ def get_vendor_name(module: etree.Element, model_data: ModuleData) -> ModuleData
     return model_data
 
 
+def index_power_logs(logs: etree.Element) -> dict[tuple[str, str, str | None], str]:
+    """Helper-function for _power_data_from_location().
+
+    Walk the P1 logs once, index the first value found per (type, log_type, tariff).
+    Under tariff None the first value found for (type, log_type) is indexed, as used for
+    the P1 gas_consumed or phase data (without tariff).
+    """
+    index: dict[tuple[str, str, str | None], str] = {}
+    for log in logs:
+        if (log_type := log.find("type")) is None:
+            continue
+        for measurement in log.iterfind("./period/measurement"):
+            index.setdefault(
+                (log_type.text, log.tag, measurement.get("tariff")), measurement.text
+            )
+            index.setdefault((log_type.text, log.tag, None), measurement.text)
+
+    return index
+
+
+def index_power_services(
+    modules: etree.Element,
+) -> dict[tuple[str, str, str | None], str]:
+    """Helper-function for _power_data_from_modules().
+
+    Walk the P1 legacy module services once, index the value per (meter kind, directionality, tariff_indicator).
+    Under tariff_indicator None the first value found for (meter kind, directionality) is indexed, as used for
+    the P1 legacy electricity_point_meter or gas_*_meter data (without tariff).
+    """
+    index: dict[tuple[str, str, str | None], str] = {}
+    for services in modules.iterfind("./module/services"):
+        found: dict[tuple[str, str, str | None], str] = {}
+        for meter in services:
+            for measurement in meter.iterfind("./measurement"):
+                directionality = measurement.get("directionality")
+                tariff = measurement.get("tariff_indicator")
+                found.setdefault((meter.tag, directionality, tariff), measurement.text)
+                found.setdefault((meter.tag, directionality, None), measurement.text)
+
+        index.update(found)
+
+    return index
+
+
+def low_battery_mac(msg_type: str, msg: str | None) -> str | None:
+    """Return the zigbee_mac_address from a Battery-is-low message or warning."""
+    if (
+        msg_type in ("message", "warning")
+        and msg is not None
+        and all(x in msg for x in ("Battery", "below"))
+        and (mac_addresses := MAC_PATTERN.findall(msg))
+    ):
+        return str(mac_addresses[0])  # re.findall() outputs a list
+
+    return None
+
+
 def power_data_energy_diff(
     measurement: str,
     net_string: SensorType,
@@ -248,9 +322,24 @@ def power_data_energy_diff(
         data["sensors"][net_string] = tmp_val
 
 
-def power_data_local_format(
-    attrs: dict[str, str], key_string: str, val: str
-) -> float | int:
+def power_data_keys(
+    measurement: str, log_type: str, peak_select: str
+) -> tuple[str, SensorType]:
+    """Return the sensor-key and the net-sensor-key for a P1 measurement."""
+    if (peak := peak_select.partition("_")[2]) == "offpeak":
+        peak = "off_peak"
+    log_found = log_type.partition("_")[0]
+    key_string = f"{measurement}_{peak}_{log_found}"
+    if "gas" in measurement or log_type == "point_meter":
+        key_string = f"{measurement}_{log_found}"
+    # Only for P1 Actual -------------------#
+    if "phase" in measurement:
+        key_string = f"{measurement}"
+    # --------------------------------------#
+    return key_string, cast(SensorType, f"net_electricity_{log_found}")
+
+
+def power_data_local_format(attrs: UOM, key_string: str, val: str) -> float | int:
     """Format power data."""
     # Special formatting of P1_MEASUREMENT POWER_WATT values, do not move to util-format_measure() function!
     if all(item in key_string for item in ("electricity", "cumulative")):
@@ -261,31 +350,6 @@ def power_data_local_format(
     return format_measure(val, attrs_uom)
 
 
-def power_data_peak_value(loc: Munch, legacy: bool) -> Munch:
-    """Helper-function for _power_data_from_location() and _power_data_from_modules()."""
-    loc.found = True
-    if loc.logs.find(loc.locator) is None:
-        loc = check_alternative_location(loc, legacy)
-        if not loc.found:
-            return loc
-
-    if (peak := loc.peak_select.partition("_")[2]) == "offpeak":
-        peak = "off_peak"
-    log_found = loc.log_type.partition("_")[0]
-    loc.key_string = f"{loc.measurement}_{peak}_{log_found}"
-    if "gas" in loc.measurement or loc.log_type == "point_meter":
-        loc.key_string = f"{loc.measurement}_{log_found}"
-    # Only for P1 Actual -------------------#
-    if "phase" in loc.measurement:
-        loc.key_string = f"{loc.measurement}"
-    # --------------------------------------#
-    loc.net_string = f"net_electricity_{log_found}"
-    val = loc.logs.find(loc.locator).text
-    loc.f_val = power_data_local_format(loc.attrs, loc.key_string, val)
-
-    return loc
-
-
 def remove_empty_platform_dicts(data: GwEntityData) -> None:
     """Helper-function for removing any empty platform dicts."""
     if not data["binary_sensors"]:
@@ -296,6 +360,16 @@ def remove_empty_platform_dicts(data: GwEntityData) -> None:
         data.pop("switches")
 
 
+def replace_element(document: etree.Element, element: etree.Element) -> None:
+    """Replace the child-element with the same tag and id by the element, add it when not present."""
+    for index, child in enumerate(document):
+        if child.tag == element.tag and child.get("id") == element.get("id"):
+            document[index] = element
+            return
+
+    document.append(element)
+
+
 def return_valid(value: etree.Element | None, default: etree.Element) -> etree.Element:
     """Return default when value is None."""
     return value if value is not None else default
@@ -316,6 +390,102 @@ def skip_obsolete_measurements(xml: etree.Element, measurement: str) -> bool:
     return False
 
 
+def store_measurement(
+    dispatch: MeasurementDispatch, text: str, data: GwEntityData
+) -> None:
+    """Convert and store a measurement as defined by its dispatch-entry."""
+    match dispatch.platform:
+        case None:
+            return
+        case "entity":
+            data[dispatch.key] = dispatch.convert(text)  # type: ignore[literal-required]
+        case platform:
+            data[platform][dispatch.key] = dispatch.convert(text)  # type: ignore[literal-required]
+
+    if dispatch.low_battery:
+        data["binary_sensors"]["low_battery"] = False
+
+
+def store_power_value(
+    data: GwEntityData,
+    measurement: str,
+    log_type: str,
+    peak_select: str,
+    val: str,
+    *,
+    measurements: Mapping[str, UOM],
+) -> None:
+    """Format and store a P1 measurement value, update the related net-value.
+
+    The unit of the measurement is taken from the measurements-table used for collecting it.
+    """
+    key_string, net_string = power_data_keys(measurement, log_type, peak_select)
+    f_val = power_data_local_format(measurements[measurement], key_string, val)
+    power_data_energy_diff(measurement, net_string, f_val, data)
+    data["sensors"][cast(SensorType, key_string)] = f_val
+
+
+def topology_fingerprint(*documents: etree.Element) -> str:
+    """Return a hash of the gateway topology present in the given XML-documents.
+
+    Covers the appliance-, group-, location- and module-ids and their links,
+    the changing measurements and states are not included.
+    """
+    items: set[tuple[str, ...]] = set()
+    for document in documents:
+        for appliance in document.findall("./appliance"):
+            location = appliance.find("./location[@id]")
+            link = "" if location is None else location.get("id")
+            items.add(
+                ("appliance", appliance.get("id"), appliance.findtext("type", ""), link)
+            )
+        for item in document.findall("./group") + document.findall("./location"):
+            members = item.findall("./appliances/appliance[@id]")
+            links = sorted(member.get("id") for member in members)
+            items.add((item.tag, item.get("id"), item.findtext("type", ""), *links))
+        for module in document.findall("./module"):
+            services = module.findall("./services/*[@id]")
+            links = sorted(service.get("id") for service in services)
+            items.add(("module", module.get("id"), *links))
+
+    return hashlib.sha256(repr(sorted(items)).encode()).hexdigest()
+
+
+def write_side_document(*documents: etree.Element) -> etree.Element:
+    """Return a compact document holding only the items used by the set-functions.
+
+    Keeps the rules, the gateway time and the appliance- and location-skeletons:
+    their id, name, type, preset and thermostat-functionalities.
+    """
+    compact = documents[0].makeelement(documents[0].tag, {})
+    skeleton_ids: set[str] = set()
+    for document in documents:
+        for item in document:
+            match item.tag:
+                case "rule":
+                    compact.append(item)
+                case "appliance" | "gateway" | "location":
+                    if item.get("id") in skeleton_ids:
+                        continue
+
+                    skeleton_ids.add(item.get("id"))
+                    skeleton = item.makeelement(item.tag, item.attrib)
+                    for tag in ("name", "type", "preset", "time"):
+                        if (child := item.find(tag)) is not None:
+                            skeleton.append(child)
+                    if thermostats := item.findall(
+                        "./actuator_functionalities/thermostat_functionality"
+                    ):
+                        functionalities = item.makeelement(
+                            "actuator_functionalities", {}
+                        )
+                        functionalities.extend(thermostats)
+                        skeleton.append(functionalities)
+                    compact.append(skeleton)
+
+    return compact
+
+
 # NOTE: this function version_to_model is shared between Smile and USB
 def version_to_model(version: str | None) -> str | None:
     """Translate hardware_version to device type."""
@@ -331,3 +501,10 @@ def version_to_model(version: str | None) -> str | None:
         model = HW_MODELS.get(version[-2:] + version[-4:-2] + version[-6:-4])
 
     return model if model is not None else "Unknown"
+
+
+# Compiled measurement dispatch tables
+DEVICE_DISPATCH: Final = compile_measurements(DEVICE_MEASUREMENTS)
+GROUP_DISPATCH: Final = compile_measurements(GROUP_MEASUREMENTS)
+HEATER_CENTRAL_DISPATCH: Final = compile_measurements(HEATER_CENTRAL_MEASUREMENTS)
+ZONE_DISPATCH: Final = compile_measurements(ZONE_MEASUREMENTS)
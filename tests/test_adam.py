@@ -1,5 +1,7 @@
 """Test Plugwise module Adam related functionality."""
 
+import sys
+
 import pytest
 
 from .test_init import _LOGGER, TestPlugwise, pw_exceptions
@@ -69,6 +71,56 @@ class TestPlugwiseAdam(TestPlugwise):  # pylint: disable=attribute-defined-outsi
         ]
         assert api.reboot
 
+        assert await self.tinker_warm_start(api, server, client)
+        assert self.tinker_entity_registry(api, "14df5c4dc8cb4ba69f9d1ac0eaf7c5c6")
+        assert await self.tinker_entity_failure(api, "1772a4ea304041adb83f357b751341ff")
+        assert await self.tinker_entity_refresh(
+            api, "ad4838d7d35c4d6ea796ee12ae5aedf8", "f2bf9048bef64cc5b6d5110154e33c81"
+        )
+        assert await self.tinker_refresh_after_write(
+            server,
+            client,
+            "f2bf9048bef64cc5b6d5110154e33c81",
+            "f2bf9048bef64cc5b6d5110154e33c81",
+        )
+        assert await self.tinker_optimistic_write(
+            server,
+            client,
+            "f2bf9048bef64cc5b6d5110154e33c81",
+            "f2bf9048bef64cc5b6d5110154e33c81",
+        )
+        assert await self.tinker_coalesced_writes(
+            server, client, "f2bf9048bef64cc5b6d5110154e33c81"
+        )
+        assert await self.tinker_scene(
+            api,
+            ["f2bf9048bef64cc5b6d5110154e33c81", "f871b8c4d63549319221e294e4f88074"],
+            "da224107914542988a88561b4452b0f6",
+        )
+        assert await self.tinker_unchanged_write(
+            api, "f871b8c4d63549319221e294e4f88074"
+        )
+        assert await self.tinker_command_journal(
+            server, client, "f871b8c4d63549319221e294e4f88074"
+        )
+        assert await self.tinker_actuation_latency(
+            server, client, "f871b8c4d63549319221e294e4f88074", "asleep"
+        )
+
+        # Interned ids, the previous entities are released after the update
+        data = await api.async_update()
+        assert not api._smile_api._previous_entities
+        member = data["e8ef2a01ed3b4139a53bf749204fe6b4"]["members"][0]
+        assert member is sys.intern(member)
+        location = data["ad4838d7d35c4d6ea796ee12ae5aedf8"]["location"]
+        assert location is sys.intern(location)
+
+        # Low-memory mode: the set-functions use the compact write-side document
+        api = self.smile_instance(server, client, low_memory=True)
+        await api.connect()
+        await api.async_update()
+        assert api._smile_api._domain_objects.find("./module") is None
+
         result = await self.tinker_thermostat(
             api,
             "f2bf9048bef64cc5b6d5110154e33c81",
@@ -225,6 +277,9 @@ class TestPlugwiseAdam(TestPlugwise):  # pylint: disable=attribute-defined-outsi
         assert api.smile.hostname == "smile000000"
 
         await self.device_test(api, "2023-12-17 00:00:01", testdata)
+        assert await self.tinker_entity_refresh(
+            api, "e2f4322d57924fa090fbbc48b3a140dc", "f871b8c4d63549319221e294e4f88074"
+        )
 
         await api.close_connection()
         await self.disconnect(server, client)
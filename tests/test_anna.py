@@ -478,6 +478,9 @@ class TestPlugwiseAnna(TestPlugwise):  # pylint: disable=attribute-defined-outsi
             api, "bfb5ee0a88e14e5f97bfa725a760cc49", "dhw_mode", 5
         )
         assert not tinkered
+        assert await self.tinker_optimistic_dhw_mode(
+            server, client, "bfb5ee0a88e14e5f97bfa725a760cc49"
+        )
 
         await api.close_connection()
         await self.disconnect(server, client)
@@ -1,6 +1,8 @@
 # pylint: disable=protected-access
 """Test Plugwise Home Assistant module and generate test JSON fixtures."""
 
+import asyncio
+import copy
 import importlib
 import json
 
@@ -12,6 +14,8 @@ from pprint import PrettyPrinter
 # String generation
 import secrets
 import string
+from unittest.mock import patch
+from xml.etree import ElementTree as ET
 
 import pytest
 
@@ -21,6 +25,7 @@ import aiohttp
 from freezegun import freeze_time
 from packaging import version
 
+pw_common = importlib.import_module("plugwise.common")
 pw_constants = importlib.import_module("plugwise.constants")
 pw_exceptions = importlib.import_module("plugwise.exceptions")
 pw_smile = importlib.import_module("plugwise")
@@ -197,6 +202,7 @@ class TestPlugwise:  # pylint: disable=attribute-defined-outside-init
 
     async def smile_domain_objects(self, request):
         """Render setup specific domain objects endpoint."""
+        self.domain_objects_requests += 1
         userdata = os.path.join(
             os.path.dirname(__file__),
             f"../userdata/{self.smile_setup}/core.domain_objects.xml",
@@ -227,6 +233,7 @@ class TestPlugwise:  # pylint: disable=attribute-defined-outside-init
 
     async def smile_status(self, request):
         """Render setup specific status endpoint."""
+        self.status_requests += 1
         try:
             userdata = os.path.join(
                 os.path.dirname(__file__),
@@ -289,6 +296,8 @@ class TestPlugwise:  # pylint: disable=attribute-defined-outside-init
         url_part=CORE_DOMAIN_OBJECTS,
     ):
         """Connect to a smile environment and perform basic asserts."""
+        self.domain_objects_requests = 0
+        self.status_requests = 0
         port = aiohttp.test_utils.unused_port()
         test_password = "".join(
             secrets.choice(string.ascii_lowercase) for _ in range(8)
@@ -350,10 +359,13 @@ class TestPlugwise:  # pylint: disable=attribute-defined-outside-init
 
         # Connect to the smile
         smile_version = None
+        self.domain_objects_requests = 0
         try:
             smile_version = await api.connect()
             assert smile_version is not None
             assert api._timeout == smile_timeout_value
+            # The detection document is reused for the initial update
+            assert self.domain_objects_requests == 1
             return server, api, client
         except (
             pw_exceptions.ConnectionFailedError,
@@ -605,6 +617,648 @@ class TestPlugwise:  # pylint: disable=attribute-defined-outside-init
         return internal_asserts
         # pragma warning restore S3776
 
+    @staticmethod
+    def smile_instance(server, client, **options):
+        """Return another Smile-instance for the test-server, constructed with the given options."""
+        return pw_smile.Smile(
+            host=server.host,
+            password="instance",
+            port=server.port,
+            websession=client.session,
+            **options,
+        )
+
+    @staticmethod
+    def connection_requests(api, requests):
+        """Return a patch of the Smile request-function, recording the uris requested from connect() on."""
+        send_request = api._request
+
+        async def request(uri, *args, **kwargs):
+            requests.append(uri)
+            return await send_request(uri, *args, **kwargs)
+
+        return patch.object(api, "_request", request)
+
+    @pytest.mark.asyncio
+    async def tinker_warm_start(self, api, server, client, identified=True):
+        """Connect again from the exported gateway profile, skipping the detection.
+
+        A Gateway not identified by the profile is detected again.
+        """
+        _LOGGER.info("Asserting a warm-start from the gateway profile:")
+        cold_requests = []
+        cold_api = self.smile_instance(server, client)
+        with self.connection_requests(cold_api, cold_requests):
+            assert await cold_api.connect() == api.smile.version
+            cold_data = await cold_api.async_update()
+
+        profile = json.loads(json.dumps(api.export_profile()))
+        warm_requests = []
+        warm_api = self.smile_instance(server, client)
+        with self.connection_requests(warm_api, warm_requests):
+            assert await warm_api.connect(profile=profile) == api.smile.version
+            assert await warm_api.async_update() == cold_data
+
+        assert warm_api.smile == api.smile
+        assert warm_api.export_profile() == api.export_profile()
+        assert (pw_constants.SYSTEM not in warm_requests) == identified
+        assert pw_constants.STATUS not in warm_requests
+        if api.smile.legacy and identified:
+            # No detection-requests, the restored topology skips the full-update
+            assert pw_constants.LOCATIONS not in warm_requests
+            assert len(warm_requests) < len(cold_requests)
+            _LOGGER.info(
+                "  + %s requests instead of %s", len(warm_requests), len(cold_requests)
+            )
+
+            # A changed legacy topology falls back to the full-update
+            profile["topology"]["fingerprint"] = BOGUS
+            changed_api = self.smile_instance(server, client)
+            assert await changed_api.connect(profile=profile) == api.smile.version
+            assert await changed_api.async_update() == cold_data
+        else:
+            assert warm_requests == cold_requests
+
+        # An outdated profile falls back to the gateway detection
+        profile["fingerprint"] = BOGUS
+        outdated_api = self.smile_instance(server, client)
+        assert await outdated_api.connect(profile=profile) == api.smile.version
+        await outdated_api.async_update()
+        assert outdated_api.export_profile() == api.export_profile()
+
+        # A profile of another Gateway, with the same topology, falls back to the gateway detection,
+        # a legacy Gateway is identified by the topology only
+        if not api.smile.legacy:
+            profile = json.loads(json.dumps(api.export_profile()))
+            profile["smile"]["mac_address"] = BOGUS
+            other_api = self.smile_instance(server, client)
+            assert await other_api.connect(profile=profile) == api.smile.version
+            await other_api.async_update()
+            assert other_api.export_profile() == api.export_profile()
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_low_memory(self, server, client, entity_id):
+        """Compare the data provided in low-memory mode with the data provided in normal mode."""
+        _LOGGER.info("Asserting the low-memory mode provides the same data:")
+        normal_api = self.smile_instance(server, client)
+        low_memory_api = self.smile_instance(server, client, low_memory=True)
+        for api in (normal_api, low_memory_api):
+            await api.connect()
+
+        # The first and an incremental update, a targeted refresh
+        for _ in range(2):
+            assert (
+                await low_memory_api.async_update() == await normal_api.async_update()
+            )
+        # Serve the single appliance from the document of the normal mode
+        request = self.element_request(normal_api, [], "./bogus", None)
+        with (
+            patch.object(normal_api._smile_api, "_request", request),
+            patch.object(low_memory_api._smile_api, "_request", request),
+        ):
+            assert await low_memory_api.async_update_entity(
+                entity_id
+            ) == await normal_api.async_update_entity(entity_id)
+        assert await low_memory_api.async_update() == await normal_api.async_update()
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_entity_failure(self, api, entity_id):
+        """Fail the update of a single entity, the other entities must be updated."""
+        _LOGGER.info("Asserting an isolated entity-update failure:")
+        data = await api.async_update()
+        last_good = dict(data[entity_id])
+        get_entity_data = api._smile_api._get_entity_data
+
+        def failing_entity_data(failing_id, entity):
+            if failing_id == entity_id:
+                raise KeyError("malformed")
+            get_entity_data(failing_id, entity)
+
+        api._smile_api._get_entity_data = failing_entity_data
+        data = await api.async_update()
+        del api._smile_api._get_entity_data
+        assert data[entity_id] == last_good
+        assert len(data) == len(await api.async_update())
+        assert api.update_errors == []
+
+        api._smile_api._get_entity_data = failing_entity_data
+        await api.async_update()
+        del api._smile_api._get_entity_data
+        assert api.update_errors == [
+            pw_constants.UpdateError(entity_id, "KeyError('malformed')", True)
+        ]
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @staticmethod
+    def tinker_entity_registry(api, entity_id):
+        """Remove and restore an entity with the dict-mutators, the indexes must follow."""
+        _LOGGER.info("Asserting the entity-registry indexes:")
+        registry = pw_common.EntityRegistry()
+        registry.update(api._smile_api.gw_entities)
+        entity = registry[entity_id]
+        dev_class = entity["dev_class"]
+        location = entity["location"]
+        zigbee_mac = entity["zigbee_mac_address"]
+        assert registry.pop(entity_id) is entity
+        assert registry.pop(entity_id, None) is None
+        assert entity_id not in registry.by_class(dev_class)
+        assert entity_id not in registry.by_location(location)
+        assert registry.by_zigbee_mac(zigbee_mac) is None
+
+        assert registry.setdefault(entity_id, entity) is entity
+        assert registry.by_zigbee_mac(zigbee_mac) == entity_id
+        registry |= {entity_id: entity}
+        assert registry.by_class(dev_class).count(entity_id) == 1
+        last_id, last = registry.popitem()
+        assert last_id not in registry.by_class(last["dev_class"])
+        # The gateway is kept in front
+        assert next(iter(registry)) == api.gateway_id
+
+        registry.clear()
+        assert registry.by_class(dev_class) == []
+        assert registry.by_location(location) == []
+        assert registry.by_zigbee_mac(zigbee_mac) is None
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    def element_request(self, api, requests, path, text):
+        """Return a request-function serving the single appliances and locations from the cached document.
+
+        The items at path are set to text, the other requests are sent to the test-server.
+        """
+        send_request = api._smile_api._request
+        document = api._smile_api._domain_objects
+        if api.smile.legacy:
+            document = api._smile_api._appliances
+
+        async def request(uri, method="get", data=None):
+            requests.append((method, uri))
+            if method != "get":
+                return await send_request(uri, method=method, data=data)
+
+            endpoint, element_id = uri.split(";id=")
+            tag = "location" if endpoint == pw_constants.LOCATIONS else "appliance"
+            element = copy.deepcopy(document.find(f'./{tag}[@id="{element_id}"]'))
+            for item in element.findall(path):
+                item.text = text
+            result = ET.Element(f"{tag}s")
+            result.append(element)
+            return result
+
+        return request
+
+    @staticmethod
+    def recorded_requests(api, requests, failing=None):
+        """Return a patch of the request-function, recording the (method, uri, data) of the requests.
+
+        The requests for a uri containing failing raise a ConnectionFailedError, an empty string fails all requests.
+        The other requests are sent to the test-server.
+        """
+        send_request = api._smile_api._request
+
+        async def request(uri, method="get", data=None):
+            requests.append((method, uri, data))
+            if failing is not None and failing in uri:
+                raise pw_exceptions.ConnectionFailedError
+            return await send_request(uri, method=method, data=data)
+
+        return patch.object(api._smile_api, "_request", request)
+
+    @pytest.mark.asyncio
+    async def tinker_entity_refresh(self, api, entity_id, zone_id=None):
+        """Refresh a single entity and zone, requesting only their appliance- and location-data."""
+        _LOGGER.info("Asserting a targeted entity-refresh:")
+        data = dict(await api.async_update())
+        requests = []
+        request = self.element_request(
+            api,
+            requests,
+            './/point_log[type="temperature"]/period/measurement',
+            "30.0",
+        )
+        item_count = api.item_count
+        with patch.object(api._smile_api, "_request", request):
+            refreshed = await api.async_update_entity(entity_id)
+            assert requests == [("get", f"{pw_constants.APPLIANCES};id={entity_id}")]
+            assert refreshed[entity_id]["sensors"]["temperature"] == 30.0
+            # The notification-based states, like low_battery, are kept
+            assert refreshed[entity_id].get("binary_sensors") == data[entity_id].get(
+                "binary_sensors"
+            )
+            assert api.item_count == item_count
+            if zone_id is not None:
+                refreshed = await api.async_update_zone(zone_id)
+                assert requests[-1] == (
+                    "get",
+                    f"{pw_constants.LOCATIONS};id={zone_id}",
+                )
+                assert refreshed[zone_id]["sensors"]["temperature"] == 30.0
+            else:
+                with pytest.raises(pw_exceptions.PlugwiseError):
+                    await api.async_update_zone(entity_id)
+
+        for item_id, entity in data.items():
+            if item_id not in (entity_id, zone_id):
+                assert refreshed[item_id] == entity
+        with pytest.raises(pw_exceptions.PlugwiseError):
+            await api.async_update_entity(BOGUS)
+
+        assert await api.async_update() == data
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_refresh_after_write(self, server, client, loc_id, entity_id):
+        """Set a temperature, only the written entity must be refreshed."""
+        _LOGGER.info("Asserting a refresh after write:")
+        api = self.smile_instance(server, client, refresh_delay=0)
+        await api.connect()
+        await api.async_update()
+        requests = []
+        api._smile_api._request = self.element_request(
+            api, requests, ".//thermostat_functionality/setpoint", "22.5"
+        )
+        await api.set_temperature(loc_id, {"setpoint": 22.5})
+        # The set-function does not await the refresh
+        assert [method for method, _ in requests] == ["put"]
+        await asyncio.gather(*api._refreshes)
+        assert [method for method, _ in requests] == ["put", "get"]
+        assert requests[1][1].endswith(f";id={entity_id}")
+        assert api.entities[entity_id]["thermostat"]["setpoint"] == 22.5
+
+        # A write without an element-id in the uri refreshes the written entity
+        gateway = api.entities[api.gateway_id]
+        if "select_regulation_mode" in gateway:
+            mode = next(
+                mode
+                for mode in gateway["regulation_modes"]
+                if mode != gateway["select_regulation_mode"]
+            )
+            await api.set_select("select_regulation_mode", api.gateway_id, mode)
+            await asyncio.gather(*api._refreshes)
+            assert requests[-1] == (
+                "get",
+                f"{pw_constants.APPLIANCES};id={api.gateway_id}",
+            )
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_optimistic_write(self, server, client, loc_id, entity_id):
+        """Set a temperature in optimistic mode, the written value must be pending until the next update."""
+        _LOGGER.info("Asserting an optimistic write:")
+        api = self.smile_instance(server, client, optimistic=True)
+        await api.connect()
+        await api.async_update()
+        setpoint = api.entities[entity_id]["thermostat"]["setpoint"]
+        await api.set_temperature(loc_id, {"setpoint": 22.5})
+        assert api.entities[entity_id]["thermostat"]["setpoint"] == 22.5
+        assert api.pending_writes == [
+            pw_constants.PendingWrite(entity_id, "thermostat", "setpoint", 22.5)
+        ]
+
+        # The test-server does not apply the write, the next update reconciles the setpoint
+        data = await api.async_update()
+        assert data[entity_id]["thermostat"]["setpoint"] == setpoint
+        assert api.pending_writes == []
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_optimistic_dhw_mode(self, server, client, heater_id):
+        """Set the 5-mode dhw mode twice in optimistic mode, the second write must be skipped."""
+        _LOGGER.info("Asserting an optimistic dhw-mode write:")
+        api = self.smile_instance(server, client, optimistic=True)
+        await api.connect()
+        await api.async_update()
+        heater = api.entities[heater_id]
+        mode = "eco"
+        assert heater["dhw_mode"] != mode
+        requests = []
+        with self.recorded_requests(api, requests):
+            for _ in range(2):
+                await api.set_dhw_mode(
+                    "dhw_mode", heater_id, mode, len(heater["dhw_modes"])
+                )
+        assert [method for method, _, _ in requests] == ["put"]
+        assert api.entities[heater_id]["dhw_mode"] == mode
+        assert "select_dhw_mode" not in api.entities[heater_id]
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_coalesced_writes(self, server, client, loc_id):
+        """Set a temperature rapidly, only the last write must be sent."""
+        _LOGGER.info("Asserting coalesced setpoint-writes:")
+        api = self.smile_instance(server, client, coalesce_window=0.01)
+        await api.connect()
+        await api.async_update()
+        requests = []
+        with self.recorded_requests(api, requests):
+            await asyncio.gather(
+                *(
+                    api.set_temperature(loc_id, {"setpoint": setpoint})
+                    for setpoint in (20.0, 21.0, 22.0)
+                )
+            )
+            await api.set_temperature(loc_id, {"setpoint": 20.0})
+
+            # A cancelled first caller does not cancel the write awaited by a later caller
+            first = asyncio.create_task(api.set_temperature(loc_id, {"setpoint": 19.0}))
+            await asyncio.sleep(0)
+            later = asyncio.create_task(api.set_temperature(loc_id, {"setpoint": 19.5}))
+            await asyncio.sleep(0)
+            first.cancel()
+            await later
+
+        writes = [data for *_, data in requests]
+        assert len(writes) == 3
+        assert "<setpoint>22.0</setpoint>" in writes[0]
+        assert "<setpoint>20.0</setpoint>" in writes[1]
+        assert "<setpoint>19.5</setpoint>" in writes[2]
+
+        # A scene-change for the same location coalesces with the queued write,
+        # the legacy thermostat has no location to address a scene-change to
+        if loc_id is not None:
+            requests = []
+            with self.recorded_requests(api, requests):
+                await asyncio.gather(
+                    api.set_temperature(loc_id, {"setpoint": 17.5}),
+                    api.apply_scene(
+                        [
+                            pw_constants.SceneChange(
+                                "temperature", loc_id, {"setpoint": 17.0}
+                            )
+                        ]
+                    ),
+                )
+            writes = [data for *_, data in requests]
+            assert len(writes) == 1
+            assert "<setpoint>17.0</setpoint>" in writes[0]
+
+        # All callers receive the error of the sent write
+        async def failing(uri, method="get", data=None):
+            raise ValueError(data)
+
+        api._smile_api._request = failing
+        outcomes = await asyncio.gather(
+            *(
+                api.set_temperature(loc_id, {"setpoint": setpoint})
+                for setpoint in (18.0, 18.5)
+            ),
+            return_exceptions=True,
+        )
+        assert [type(outcome) for outcome in outcomes] == [ValueError, ValueError]
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_group_member_failure(self, api, group_id, members, failing):
+        """Switch a group with a failing member, the other members must be switched."""
+        _LOGGER.info("Asserting per-member outcome of a group-switch:")
+        requests = []
+        with self.recorded_requests(api, requests, failing):
+            result = await api.set_switch_state(
+                group_id, members, "relay", "on", force=True
+            )
+        assert result
+        outcome = {item.entity_id: item for item in api.switch_results}
+        assert list(outcome) == members
+        assert not outcome[failing].switched
+        assert outcome[failing].error is not None
+        for member, item in outcome.items():
+            if member == failing:
+                continue
+            locked = api._smile_api.gw_entities[member]["switches"]["lock"]
+            assert item == pw_constants.SwitchResult(member, not locked, None)
+
+        with (
+            self.recorded_requests(api, requests, failing),
+            pytest.raises(pw_exceptions.ConnectionFailedError),
+        ):
+            await api.set_switch_state(group_id, [failing], "relay", "on", force=True)
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_scene(self, api, zones, gateway_id):
+        """Apply a scene across zones, validated up front, with a per-change outcome."""
+        _LOGGER.info("Asserting a scene across zones:")
+        requests = []
+        scene_change = pw_constants.SceneChange
+        with (
+            self.recorded_requests(api, requests, zones[-1]),
+            pytest.raises(pw_exceptions.PlugwiseError),
+        ):
+            await api.apply_scene(
+                [
+                    scene_change("preset", zones[0], "away"),
+                    scene_change("preset", zones[0], "home"),
+                    scene_change("preset", zones[1], "bogus"),
+                    scene_change("temperature", zones[0], {"setpoint": 99.0}),
+                    scene_change("regulation_mode", gateway_id, "bogus"),
+                ]
+            )
+        assert not requests
+
+        changes = [
+            *(scene_change("preset", zone, "away") for zone in zones),
+            scene_change("temperature", zones[0], {"setpoint": 18.5}),
+            scene_change("gateway_mode", gateway_id, "vacation"),
+        ]
+        events = []
+        send_change = api._send_change
+
+        async def record_change(change, force):
+            events.append(("start", change.kind, change.target))
+            try:
+                await send_change(change, force)
+            finally:
+                events.append(("end", change.kind, change.target))
+
+        with (
+            self.recorded_requests(api, requests, zones[-1]),
+            patch.object(api, "_send_change", record_change),
+        ):
+            results = await api.apply_scene(changes)
+        # The changes for the same zone are sent one after another, in order
+        zone_events = [event[:2] for event in events if event[2] == zones[0]]
+        assert zone_events == [
+            ("start", "preset"),
+            ("end", "preset"),
+            ("start", "temperature"),
+            ("end", "temperature"),
+        ]
+        assert [result.change for result in results] == changes
+        assert [result.error is None for result in results] == [
+            *(zone != zones[-1] for zone in zones),
+            True,
+            True,
+        ]
+        assert len(requests) == len(changes)
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_unchanged_write(self, api, loc_id):
+        """Write the cached values, the writes must be skipped unless forced."""
+        _LOGGER.info("Asserting skipped unchanged writes:")
+        requests = []
+        zone = api._smile_api.gw_entities[loc_id]
+        gateway = api._smile_api.gw_entities[api.gateway_id]
+        with self.recorded_requests(api, requests):
+            await api.set_preset(loc_id, zone["active_preset"])
+            await api.set_temperature(
+                loc_id, {"setpoint": zone["thermostat"]["setpoint"]}
+            )
+            await api.set_select(
+                "select_zone_profile", loc_id, zone["select_zone_profile"]
+            )
+            await api.set_gateway_mode(gateway["select_gateway_mode"])
+            await api.set_regulation_mode(gateway["select_regulation_mode"])
+            assert not requests
+            await api.set_preset(loc_id, zone["active_preset"], force=True)
+        assert [uri for _, uri, _ in requests] == [
+            f"{pw_constants.LOCATIONS};id={loc_id}"
+        ]
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_command_journal(self, server, client, loc_id):
+        """Journal the writes failing on a connection-error, replay them by the next update."""
+        _LOGGER.info("Asserting the offline command-journal:")
+        api = self.smile_instance(server, client, journal_max_age=60)
+        await api.connect()
+        await api.async_update()
+        requests = []
+        # Offline: all requests fail
+        with self.recorded_requests(api, requests, ""):
+            for setpoint in (19.0, 19.5):
+                with pytest.raises(pw_exceptions.ConnectionFailedError):
+                    await api.set_temperature(loc_id, {"setpoint": setpoint})
+            with pytest.raises(pw_exceptions.ConnectionFailedError):
+                await api.reboot_gateway()
+            # The superseded write is coalesced, the reboot is not journaled
+            journal = api.export_journal()
+            assert len(journal) == 1
+            assert "<setpoint>19.5</setpoint>" in journal[0]["data"]
+            with pytest.raises(pw_exceptions.ConnectionFailedError):
+                await api.async_update()
+            assert api.export_journal() == journal
+
+        # A later successful write cancels the journaled write
+        await api.set_temperature(loc_id, {"setpoint": 23.0}, force=True)
+        assert api.export_journal() == []
+
+        expired = {**journal[0], "uri": f"{journal[0]['uri']}/expired", "expires": 0}
+        # A persisted journal is restored from JSON
+        api.restore_journal(json.loads(json.dumps([journal[0], expired])))
+        requests = []
+        with self.recorded_requests(api, requests):
+            await api.async_update()
+        uris = [uri for _, uri, _ in requests]
+        assert uris[0] == journal[0]["uri"]
+        assert expired["uri"] not in uris
+        # The replayed write is tracked for the actuation-latency
+        assert 19.5 in [
+            actuation.write.value
+            for actuation in api._smile_api._actuations
+            if actuation.write.key == "setpoint"
+        ]
+
+        # Offline at the connection: a poll does not wait for the replay as well
+        requests = []
+
+        async def offline(command, *args):
+            requests.append(command)
+            raise pw_exceptions.ConnectionFailedError
+
+        with patch.object(api, "_send_request", offline):
+            with pytest.raises(pw_exceptions.ConnectionFailedError):
+                await api.set_temperature(loc_id, {"setpoint": 19.0})
+            journal = api.export_journal()
+            requests = []
+            with pytest.raises(pw_exceptions.ConnectionFailedError):
+                await api.async_update()
+            assert journal[0]["uri"] not in requests
+
+        # Connected again: the journal is replayed after the first successful update
+        requests = []
+        with self.recorded_requests(api, requests):
+            await api.async_update()
+        assert [uri for _, uri, _ in requests][-1] == journal[0]["uri"]
+        assert api.export_journal() == []
+        with pytest.raises(pw_exceptions.PlugwiseError):
+            self.smile_instance(server, client).export_journal()
+        _LOGGER.info("  + worked as intended")
+        return True
+
+    @pytest.mark.asyncio
+    async def tinker_actuation_latency(self, server, client, loc_id, preset):
+        """Write a preset, the later update confirming it must record the actuation-latency."""
+        _LOGGER.info("Asserting the actuation-latency:")
+        api = self.smile_instance(server, client)
+        await api.connect()
+        await api.async_update()
+        written = [
+            pw_constants.PendingWrite(loc_id, None, "active_preset", preset),
+            pw_constants.PendingWrite(
+                loc_id,
+                None,
+                "active_preset",
+                api._smile_api.gw_entities[loc_id]["active_preset"],
+            ),
+        ]
+        # A forced write of the shown preset has no actuation to track
+        await api.set_preset(loc_id, written[1].value, force=True)
+        assert written[1] not in [
+            actuation.write for actuation in api._smile_api._actuations
+        ]
+
+        await api.set_preset(loc_id, preset)
+        assert written[0] in [
+            actuation.write for actuation in api._smile_api._actuations
+        ]
+        # An update not showing the preset yet records no latency
+        await api.async_update()
+        assert "active_preset" not in api.actuation_latency
+
+        send_request = api._smile_api._request
+
+        async def confirming(uri, method="get", data=None):
+            result = await send_request(uri, method=method, data=data)
+            if uri == pw_constants.DOMAIN_OBJECTS:
+                result.find(f'./location[@id="{loc_id}"]/preset').text = preset
+            return result
+
+        with patch.object(api._smile_api, "_request", confirming):
+            await api.async_update()
+        stats = api.actuation_latency["active_preset"]
+        assert stats.gateway_type == api._target_smile
+        assert stats.samples == 1
+        assert 0 <= stats.minimum <= stats.median <= stats.p95 <= stats.maximum
+        assert written[0] not in [
+            actuation.write for actuation in api._smile_api._actuations
+        ]
+        # Every set-command tracks the items it writes
+        profile = next(
+            profile
+            for profile in pw_constants.ALLOWED_ZONE_PROFILES
+            if profile != api._smile_api.gw_entities[loc_id]["select_zone_profile"]
+        )
+        await api.set_select("select_zone_profile", loc_id, profile)
+        assert pw_constants.PendingWrite(
+            loc_id, None, "select_zone_profile", profile
+        ) in [actuation.write for actuation in api._smile_api._actuations]
+        _LOGGER.info("  + worked as intended")
+        return True
+
     @pytest.mark.asyncio
     async def tinker_reboot(self, api, unhappy=False):
         """Test rebooting a gateway."""
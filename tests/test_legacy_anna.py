@@ -33,6 +33,26 @@ class TestPlugwiseAnna(TestPlugwise):  # pylint: disable=attribute-defined-outsi
         assert self.entity_items == 45
         assert not api.reboot
 
+        assert await self.tinker_warm_start(api, server, client)
+        assert await self.tinker_entity_failure(api, "0d266432d64443e283b5d708ae98b455")
+        assert await self.tinker_entity_refresh(api, "0d266432d64443e283b5d708ae98b455")
+        assert await self.tinker_low_memory(
+            server, client, "0d266432d64443e283b5d708ae98b455"
+        )
+        assert await self.tinker_refresh_after_write(
+            server, client, None, "0d266432d64443e283b5d708ae98b455"
+        )
+        assert await self.tinker_optimistic_write(
+            server, client, None, "0d266432d64443e283b5d708ae98b455"
+        )
+        assert await self.tinker_coalesced_writes(server, client, None)
+
+        # Low-memory mode: the set-functions use the compact write-side document
+        api = self.smile_instance(server, client, low_memory=True)
+        await api.connect()
+        await api.async_update()
+        assert api._smile_api._domain_objects.find("./module") is None
+
         result = await self.tinker_legacy_thermostat(api, schedule_on=False)
         assert result
 
@@ -67,6 +87,10 @@ class TestPlugwiseAnna(TestPlugwise):  # pylint: disable=attribute-defined-outsi
         assert api.gateway_id == "be81e3f8275b4129852c4d8d550ae2eb"
         assert self.entity_items == 45
 
+        assert await self.tinker_low_memory(
+            server, client, "9e7377867dc24e51b8098a5ba02bd89d"
+        )
+
         result = await self.tinker_legacy_thermostat(api)
         assert result
 
@@ -1,5 +1,7 @@
 """Test Plugwise module Stretch related functionality."""
 
+from unittest.mock import patch
+
 import pytest
 
 from .test_init import _LOGGER, TestPlugwise
@@ -36,6 +38,37 @@ class TestPlugwiseStretch(TestPlugwise):  # pylint: disable=attribute-defined-ou
             "059e4d03c7a34d278add5c7a4a781d19",
         )
         assert not switch_change
+        # A failing member does not block the other members of the group
+        assert await self.tinker_group_member_failure(
+            api,
+            "d950b314e9d8499f968e6db8d82ef78c",
+            [
+                "059e4d03c7a34d278add5c7a4a781d19",
+                "5871317346d045bc9f6b987ef25ee638",
+                "aac7b735042c4832ac9ff33aae4f453b",
+                "cfe95cf3de1948c0b8955125bf754614",
+                "e1c884e7dede431dadee09506ec4f859",
+            ],
+            "5871317346d045bc9f6b987ef25ee638",
+        )
+
+        # An unchanged topology keeps the entities, a changed topology triggers a full-update
+        get_all_gateway_entities = api._smile_api.get_all_gateway_entities
+        with patch.object(
+            api._smile_api,
+            "get_all_gateway_entities",
+            side_effect=get_all_gateway_entities,
+        ) as rebuild:
+            entities = await api.async_update()
+            rebuild.assert_not_called()
+
+            api._smile_api._topology = "changed"
+            rebuilt_entities = await api.async_update()
+            rebuild.assert_called_once()
+
+        assert rebuilt_entities is not entities
+        assert rebuilt_entities == entities
+        assert api._smile_api._topology != "changed"
 
         # Now change some data and change directory reading xml from
         # emulating reading newer dataset after an update_interval
@@ -114,6 +147,11 @@ class TestPlugwiseStretch(TestPlugwise):  # pylint: disable=attribute-defined-ou
             api, "8b8d14b242e24cd789743c828b9a2ea9"
         )
         assert switch_change
+        assert await self.tinker_low_memory(
+            server, client, "8b8d14b242e24cd789743c828b9a2ea9"
+        )
+        # No modules in the domain_objects, the Stretch is detected again
+        assert await self.tinker_warm_start(api, server, client, identified=False)
 
         await api.close_connection()
         await self.disconnect(server, client)